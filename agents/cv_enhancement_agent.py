@@ -8,22 +8,896 @@ This agent provides comprehensive CV enhancement services including:
 - Professional formatting
 """
 
+import asyncio
+import atexit
+import base64
 import json
 import logging
 import os
+import re
+import string
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import cached_property, lru_cache
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import Dict, Optional, TypedDict, Union
+from typing import Any, Dict, List, Optional, Tuple, TypedDict, Union
 
+import httpx
 import openai
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, StateGraph
 
+# PDF backends are probed once at import, in order of preference
+try:
+    import markdown
+    from xhtml2pdf import pisa
+except ImportError:
+    markdown = pisa = None
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import ListFlowable, Paragraph, SimpleDocTemplate, Spacer
+except ImportError:
+    SimpleDocTemplate = None
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+# Optional speedups for async runs
+try:
+    import h2  # noqa: F401  # lets httpx negotiate HTTP/2
+except ImportError:
+    _HTTP2 = False
+else:
+    _HTTP2 = True
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from common.settings import config
-from core.document_loader import detect_file_type, load_document
-from lib.utils import get_access_token_from_copilot
+from core.document_loader import (
+    detect_file_type,
+    load_document,
+    load_document_batch,
+)
+from lib.utils import (
+    aget_access_token_from_copilot,
+    get_access_token_from_copilot,
+    invalidate_copilot_token,
+    process_pool_context,
+)
 
 logger = logging.getLogger(__name__)
 
+# Compiled template bytecode survives restarts (empty dir = Jinja's temp dir)
+if config.JINJA_CACHE_DIR:
+    os.makedirs(config.JINJA_CACHE_DIR, exist_ok=True)
+
+# Shared across all agent instances so templates are compiled once per process
+_JINJA_ENV = Environment(
+    loader=FileSystemLoader("templates"),
+    autoescape=True,
+    auto_reload=False,
+    cache_size=400,
+    bytecode_cache=FileSystemBytecodeCache(
+        directory=config.JINJA_CACHE_DIR or None, pattern="%s.cache"
+    ),
+)
+
+
+@lru_cache(maxsize=None)
+def _get_template(name: str):
+    """Resolve and compile a template once, reusing it on later calls."""
+    return _JINJA_ENV.get_template(name)
+
+
+_SYSTEM_PROMPT = (
+    "You are an expert CV enhancement specialist with deep knowledge of "
+    "recruitment, ATS systems, and professional presentation."
+)
+
+_CONTINUE_PROMPT = "Continue exactly where you stopped, without repeating anything."
+
+_ENHANCEMENT_REQUIREMENTS = """## Enhancement Requirements:
+
+### 1. Header & Name Formatting
+- Start with the candidate's name as the MAIN HEADER (use # in markdown). First name full and then Initial (Example: Satadeep Dasgupta -> Satadeep D).
+- Follow with job title/role (use ## in markdown)
+- Do NOT include any contact information, addresses, emails, or phone numbers
+- Keep the header clean and professional
+
+### 2. Section Structure (Use these EXACT section titles with ### headers):
+- Professional Summary:
+- Core Technical Skills:
+- Professional Experience:
+- Education:
+
+### 3. Text Formatting Guidelines
+- Use **bold** for ALL technical skills (programming languages, frameworks, tools, technologies)
+- Use **bold** for job titles/positions and company types
+- Use **bold** for key achievements and quantifiable metrics (numbers, percentages, results)
+- Use **bold** for important keywords that match the job description
+- Use **bold** for certifications, degrees, and qualifications
+- Format all bullet points with proper markdown bullets (- or •)
+- Make every technical term, tool, and skill name **bold** to stand out
+
+### 4. JD Alignment & Content Refinement
+- Analyze job requirements and optimize CV content accordingly
+- Add missing elements that align with job requirements (realistically)
+- Optimize keywords for ATS compatibility
+- Enhance achievements with quantifiable results
+
+### 5. Anonymization
+- Remove ALL company names - Only current company should be Brainium Information Technologies Pvt Ltd
+- Remove ALL personal contact details (email, phone, address, college name or school name)
+- Maintain role context without revealing specific organizations
+
+### 6. Portfolio & Project Enhancement
+- Expand project descriptions with technical details
+- Add relevant tech stacks and methodologies
+- Include project scope and business impact with metrics
+- Add modern technologies that align with the JD (realistically)
+
+### 7. Content Restrictions
+- Do NOT include "Portfolio, code samples, and certification transcripts available upon request"
+- Do NOT include any availability statements or contact requests
+- Do NOT include any meta-commentary about the enhancement process
+- Do NOT mention that "this CV was enhanced" or reference the enhancement process
+- Focus only on professional qualifications and achievements
+
+"""
+
+# Compiled once; only the CV, job description and extra context vary per call
+_ENHANCEMENT_PROMPT = string.Template(
+    "You are an expert CV enhancement specialist. Transform the provided CV to "
+    "align with the job description while maintaining authenticity.\n\n"
+    + _ENHANCEMENT_REQUIREMENTS
+    + """## Current CV:
+$cv_content
+
+## Job Description:
+$job_description
+$additional_context
+
+Return ONLY the enhanced CV content starting with the candidate's name as the main header (#), followed by role (##), then the sections using ### headers: Professional Summary:, Core Technical Skills:, Professional Experience:, Education:. Use proper markdown formatting and do not include any commentary about the enhancement process."""
+)
+
+_BATCH_ENHANCEMENT_PROMPT = string.Template(
+    "You are an expert CV enhancement specialist. Transform each of the $count "
+    "CVs below to align with the job description while maintaining authenticity. "
+    "Apply the requirements to every CV independently.\n\n"
+    + _ENHANCEMENT_REQUIREMENTS
+    + """## Job Description:
+$job_description
+$additional_context
+
+## CVs:
+$cvs
+
+Return ONLY a JSON object of the form {"results": [{"id": <CV id>, "cv": "<enhanced CV>"}]} with exactly one entry per CV id. Each "cv" value is the enhanced CV in markdown, starting with the candidate's name as the main header (#), followed by role (##), then the sections using ### headers: Professional Summary:, Core Technical Skills:, Professional Experience:, Education:. Do not include any commentary about the enhancement process."""
+)
+
+
+_LOGO_PATH = Path("assets") / "brainium-logo.svg"
+
+_LOGO_IMG_HTML = """
+<div style="text-align: center; margin-bottom: 20px;">
+    <img src="data:image/svg+xml;base64,{logo_data}" alt="Brainium Logo" style="max-width: 150px; height: auto; display: block; margin: 0 auto;">
+</div>
+"""
+
+_PDF_TEXT_LOGO_HTML = """
+<div style="text-align: left; margin-bottom: 20px; border-bottom: 1px solid #e0e0e0; padding-bottom: 15px;">
+    <div style="font-size: 18px; font-weight: bold; color: #cc0000;">BRAINIUM</div>
+</div>
+"""
+
+_EDITED_PDF_TEXT_LOGO_HTML = """
+<div style="text-align: center; margin-bottom: 20px; padding-bottom: 15px;">
+    <div style="font-size: 18px; font-weight: bold; color: #000000;">BRAINIUM</div>
+</div>
+"""
+
+# Static parts of the xhtml2pdf document, with per-page header/footer frames
+_PDF_DOCUMENT_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <style>
+        @page {
+            size: a4 portrait;
+            @frame header_frame {           /* Static Frame */
+                -pdf-frame-content: header_content;
+                left: 50pt; width: 512pt; top: 50pt; height: 60pt;
+            }
+            @frame content_frame {          /* Content Frame */
+                left: 50pt; width: 512pt; top: 120pt; height: 602pt;
+            }
+            @frame footer_frame {           /* Another static Frame */
+                -pdf-frame-content: footer_content;
+                left: 50pt; width: 512pt; top: 772pt; height: 20pt;
+            }
+        }
+        body {
+            font-family: Arial, sans-serif;
+            line-height: 1.4;
+            color: #000000;
+            margin: 0;
+            padding: 0;
+            font-size: 15px;
+        }
+        #header_content {
+            -pdf-frame-content: header_content;
+            text-align: center;
+            padding-bottom: 5px;
+        }
+        #footer_content {
+            -pdf-frame-content: footer_content;
+        }
+        h1, h2, h3, h4, h5, h6 {
+            color: #000000;
+            margin-top: 15px;
+            margin-bottom: 8px;
+            font-size: 15px;
+        }
+        h1 {
+            font-size: 15px;
+            text-align: right;
+            margin-top: 0;
+            margin-bottom: 2px;
+        }
+        h2 {
+            font-size: 15px;
+            text-align: right;
+            margin-top: 2px;
+            margin-bottom: 15px;
+            border-bottom: 1px solid #cccccc;
+            padding-bottom: 2px;
+        }
+        h3 {
+            font-size: 15px;
+            margin-top: 20px;
+            margin-bottom: 10px;
+            text-decoration: underline;
+        }
+        p {
+            font-size: 15px;
+        }
+        li {
+            font-size: 15px;
+        }
+        ul, ol {
+            margin: 5px 0;
+            padding-left: 20px;
+        }
+        li {
+            margin: 2px 0;
+            line-height: 1.3;
+        }
+        ul li {
+            list-style-type: disc;
+        }
+        ul li ul li {
+            list-style-type: circle;
+        }
+        p {
+            margin: 5px 0;
+        }
+        strong {
+            color: #333333;
+        }
+        code {
+            background-color: #f8f9fa;
+            padding: 2px 4px;
+            border-radius: 3px;
+            font-family: monospace;
+        }
+    </style>
+</head>
+<body>
+<!-- Header content for every page -->
+<div id="header_content">
+"""
+_PDF_DOCUMENT_BODY = """
+</div>
+
+<!-- Footer content for every page -->
+<div id="footer_content">
+    <!-- Optional footer content -->
+</div>
+
+<!-- Main content goes in content frame -->
+"""
+_PDF_DOCUMENT_TAIL = """
+</body>
+</html>
+"""
+
+# Document head for PDFs regenerated from edited text; it shares the body
+# and tail with _PDF_DOCUMENT_HEAD but keeps its own list and heading styles
+_EDITED_PDF_DOCUMENT_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <style>
+        @page {
+            size: a4 portrait;
+            @frame header_frame {           /* Static Frame */
+                -pdf-frame-content: header_content;
+                left: 50pt; width: 512pt; top: 50pt; height: 60pt;
+            }
+            @frame content_frame {          /* Content Frame */
+                left: 50pt; width: 512pt; top: 120pt; height: 602pt;
+            }
+            @frame footer_frame {           /* Another static Frame */
+                -pdf-frame-content: footer_content;
+                left: 50pt; width: 512pt; top: 772pt; height: 20pt;
+            }
+        }
+        body {
+            font-family: Arial, sans-serif;
+            line-height: 1.4;
+            color: #000000;
+            margin: 0;
+            padding: 0;
+            font-size: 15px;
+        }
+        #header_content {
+            -pdf-frame-content: header_content;
+            text-align: center;
+            padding-bottom: 5px;
+        }
+        #footer_content {
+            -pdf-frame-content: footer_content;
+        }
+        h1, h2, h3, h4, h5, h6 {
+            color: #000000;
+            margin-top: 15px;
+            margin-bottom: 8px;
+            font-size: 15px;
+        }
+        h1 {
+            font-size: 15px;
+            text-align: right;
+            margin-top: 0;
+            margin-bottom: 2px;
+            padding-bottom: 2px;
+        }
+        h2 {
+            font-size: 15px;
+            margin-top: 2px;
+            margin-bottom: 8px;
+            border-bottom: 1px solid #cccccc;
+            padding-bottom: 2px;
+            text-align: right;
+        }
+        h3 {
+            font-size: 15px;
+            text-decoration: underline;
+        }
+        ul, ol {
+            margin: 5px 0;
+            padding-left: 20px;
+            list-style-type: disc;
+        }
+        li {
+            margin: 2px 0;
+            line-height: 1.3;
+            font-size: 15px;
+            list-style-type: disc;
+            list-style-position: outside;
+        }
+        ul li {
+            list-style-type: disc;
+            list-style-position: outside;
+        }
+        ul li ul li {
+            list-style-type: circle;
+            list-style-position: outside;
+        }
+        p {
+            margin: 5px 0;
+            font-size: 15px;
+        }
+        strong {
+            color: #333333;
+        }
+        code {
+            background-color: #f8f9fa;
+            padding: 2px 4px;
+            border-radius: 3px;
+            font-family: monospace;
+        }
+    </style>
+</head>
+<body>
+<!-- Header content for every page -->
+<div id="header_content">
+"""
+
+
+@lru_cache(maxsize=1)
+def _read_logo_base64() -> str:
+    """Read and base64-encode the Brainium logo once ("" if it is missing)."""
+    if not _LOGO_PATH.exists():
+        return ""
+    return base64.b64encode(_LOGO_PATH.read_bytes()).decode("utf-8")
+
+
+@lru_cache(maxsize=1)
+def _reportlab_styles() -> Dict[str, Any]:
+    """Paragraph styles for the reportlab fallback, resolved once per process."""
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+
+    sample = getSampleStyleSheet()
+    # spaceAfter replaces the Spacer(1, 6) that used to follow every line
+    return {
+        "title": ParagraphStyle("cv_title", parent=sample["Title"], spaceAfter=6),
+        "heading1": ParagraphStyle(
+            "cv_heading1", parent=sample["Heading1"], spaceAfter=6
+        ),
+        "heading2": ParagraphStyle(
+            "cv_heading2", parent=sample["Heading2"], spaceAfter=6
+        ),
+        "normal": ParagraphStyle("cv_normal", parent=sample["Normal"], spaceAfter=6),
+        "bullet": ParagraphStyle("cv_bullet", parent=sample["Normal"], spaceAfter=6),
+    }
+
+
+# Patterns used by the HTML helpers, compiled once at import
+_CONTENT_DIV_RE = re.compile(
+    r'<div class="content">\s*(.*?)\s*</div>', re.IGNORECASE | re.DOTALL
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n")
+_SPACES_RE = re.compile(r"[ \t]+")
+
+# (opening, closing) markers emitted per tag; unlisted tags are dropped
+_TEXT_MARKERS = {
+    **{f"h{level}": ("\n", "\n") for level in range(1, 7)},
+    "p": ("\n", "\n"),
+    "li": ("• ", "\n"),
+    "br": ("\n", ""),
+}
+_MARKDOWN_MARKERS = {
+    **{f"h{level}": ("#" * level + " ", "") for level in range(1, 5)},
+    "p": ("", "\n"),
+    "li": ("- ", ""),
+    "strong": ("**", "**"),
+    "b": ("**", "**"),
+    "em": ("*", "*"),
+    "i": ("*", "*"),
+    "br": ("\n", ""),
+}
+
+
+class _MarkupEmitter(HTMLParser):
+    """Single-pass HTML walker that rewrites tags into text markers."""
+
+    def __init__(self, markers: Dict[str, Tuple[str, str]]):
+        # Keep entities as-is; callers expect the same escaping as the input
+        super().__init__(convert_charrefs=False)
+        self.markers = markers
+        self.parts: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        marker = self.markers.get(tag)
+        if marker and marker[0]:
+            self.parts.append(marker[0])
+
+    def handle_endtag(self, tag):
+        marker = self.markers.get(tag)
+        if marker and marker[1]:
+            self.parts.append(marker[1])
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+    def handle_entityref(self, name):
+        self.parts.append(f"&{name};")
+
+    def handle_charref(self, name):
+        self.parts.append(f"&#{name};")
+
+
+def _convert_markup(html_content: str, markers: Dict[str, Tuple[str, str]]) -> str:
+    """Convert HTML to plain text/markdown in one pass and tidy whitespace."""
+    emitter = _MarkupEmitter(markers)
+    emitter.feed(html_content)
+    emitter.close()
+    text = "".join(emitter.parts)
+    text = _BLANK_LINES_RE.sub("\n\n", text)  # Multiple newlines to double
+    text = _SPACES_RE.sub(" ", text)  # Multiple spaces to single
+    return text.strip()
+
+
+def _extract_enhanced_content(html_content: str) -> str:
+    """Extract just the enhanced CV content from HTML template."""
+
+    # Find content between <div class="content"> tags
+    content_match = _CONTENT_DIV_RE.search(html_content)
+    if content_match:
+        return content_match.group(1).strip()
+
+    # Fallback: extract content after </style> and before </body>
+    style_end = html_content.find("</style>")
+    body_end = html_content.find("</body>")
+    if style_end != -1 and body_end != -1:
+        content_section = html_content[style_end + 8 : body_end]
+        # Remove HTML tags but keep the enhanced content
+        content_section = _TAG_RE.sub("", content_section)
+        return content_section.strip()
+
+    # Last resort: return original content
+    return _html_to_text(html_content)
+
+
+def _html_to_text(html_content: str) -> str:
+    """Convert HTML content to clean text."""
+    return _convert_markup(html_content, _TEXT_MARKERS)
+
+
+def _html_to_markdown(html_content: str) -> str:
+    """Convert HTML content to clean markdown."""
+
+    # First extract the enhanced content
+    enhanced_content = _extract_enhanced_content(html_content)
+
+    # If it's already mostly markdown-like, return it
+    if "<" not in enhanced_content:
+        return enhanced_content
+
+    return _convert_markup(enhanced_content, _MARKDOWN_MARKERS)
+
+
+def _add_formatted_text_to_pdf(doc, text_content: str) -> None:
+    """Lay out text top-down with PyMuPDF, one text box per run of lines."""
+
+    font_size = 11
+    line_height = 14
+    margin = 72  # 1 inch
+
+    page = doc.new_page()
+    y_position = margin
+    block: List[str] = []
+    block_size = font_size
+
+    def insert_block(lines: List[str]) -> float:
+        rect = fitz.Rect(
+            margin, y_position, page.rect.width - margin, page.rect.height - margin
+        )
+        # PyMuPDF wraps the text itself; a negative result means it did not fit
+        # and nothing was written
+        spare = page.insert_textbox(
+            rect,
+            "\n".join(lines),
+            fontsize=block_size,
+            fontname="helv",
+            align=fitz.TEXT_ALIGN_LEFT,
+        )
+        return spare if spare < 0 else rect.y1 - spare
+
+    def place(lines: List[str]) -> None:
+        nonlocal page, y_position
+        bottom = insert_block(lines)
+        if bottom < 0 and y_position > margin:
+            # Not enough room left on this page; continue on a fresh one
+            page = doc.new_page()
+            y_position = margin
+            bottom = insert_block(lines)
+        if bottom >= 0:
+            y_position = bottom
+            return
+
+        # Longer than a whole page: lay it out line by line instead, halving
+        # a single line that still overflows
+        if len(lines) > 1:
+            for line in lines:
+                place([line])
+            return
+        words = lines[0].split(" ")
+        if len(words) > 1:
+            middle = len(words) // 2
+            place([" ".join(words[:middle])])
+            place([" ".join(words[middle:])])
+        else:
+            middle = len(lines[0]) // 2
+            place([lines[0][:middle]])
+            place([lines[0][middle:]])
+
+    def flush_block() -> None:
+        if block:
+            place(block)
+            block.clear()
+
+    for line in text_content.split("\n"):
+        line = line.strip()
+        if not line:
+            flush_block()
+            y_position += line_height * 0.5  # Smaller space for empty lines
+            continue
+
+        # Check if it's a header (all caps or short line)
+        size = font_size + 2 if line.isupper() or len(line) < 50 else font_size
+        if size != block_size:
+            flush_block()
+            block_size = size
+        block.append(line)
+
+    flush_block()
+
+
+def _pdf_via_xhtml2pdf(html_content: str, pdf_path: Path, logo_html: str) -> None:
+    """Render the CV through markdown + xhtml2pdf (clean and simple)."""
+    # Extract and convert HTML content to markdown
+    markdown_content = _html_to_markdown(html_content)
+
+    # Convert markdown to HTML with proper extensions
+    html = markdown.markdown(
+        markdown_content,
+        extensions=["tables", "fenced_code", "nl2br", "sane_lists"],
+    )
+
+    # Only the logo and the converted body vary per CV
+    styled_html = "".join(
+        (
+            _PDF_DOCUMENT_HEAD,
+            logo_html,
+            _PDF_DOCUMENT_BODY,
+            html,
+            _PDF_DOCUMENT_TAIL,
+        )
+    )
+
+    with open(pdf_path, "wb") as f:
+        pisa.CreatePDF(styled_html, dest=f)
+
+
+def _pdf_via_reportlab(html_content: str, pdf_path: Path, logo_html: str) -> None:
+    """Render the CV with reportlab (pure Python PDF generation)."""
+    doc = SimpleDocTemplate(
+        str(pdf_path),
+        pagesize=letter,
+        rightMargin=72,
+        leftMargin=72,
+        topMargin=72,
+        bottomMargin=18,
+    )
+    styles = _reportlab_styles()
+
+    # Extract and process enhanced content (not HTML template)
+    enhanced_content = _extract_enhanced_content(html_content)
+
+    # Create story (content) for PDF
+    story = []
+    bullets = []
+
+    def flush_bullets():
+        if bullets:
+            story.append(
+                ListFlowable(
+                    list(bullets),
+                    bulletType="bullet",
+                    start="•",
+                    leftIndent=10,
+                )
+            )
+            bullets.clear()
+
+    # Process content line by line
+    for line in enhanced_content.split("\n"):
+        line = line.strip()
+
+        if line.startswith("- "):
+            # Bullet points are grouped into a single list
+            bullets.append(Paragraph(line[2:], styles["bullet"]))
+            continue
+        flush_bullets()
+
+        if not line:
+            story.append(Spacer(1, 6))
+        # Detect different content types
+        elif line.startswith("**") and line.endswith("**"):
+            # Bold headers
+            header_text = line.replace("**", "").strip()
+            if len(header_text) < 30:  # Short headers = main titles
+                story.append(Paragraph(header_text, styles["title"]))
+            else:  # Longer headers = subtitles
+                story.append(Paragraph(header_text, styles["heading1"]))
+        elif line.startswith("---"):
+            # Separators
+            story.append(Spacer(1, 18))
+        elif (
+            line.replace(" ", "").replace("-", "").replace("_", "").isalnum()
+            and len(line) < 50
+        ):
+            # Section headers (short lines, mostly alphanumeric)
+            story.append(Paragraph(line, styles["heading2"]))
+        else:
+            # Regular text
+            story.append(Paragraph(line, styles["normal"]))
+
+    flush_bullets()
+    doc.build(story)
+
+
+def _pdf_via_pymupdf(html_content: str, pdf_path: Path, logo_html: str) -> None:
+    """Render the CV as formatted plain text with PyMuPDF."""
+    doc = fitz.open()  # create new PDF
+
+    # Format the text nicely in the PDF, adding pages as needed
+    _add_formatted_text_to_pdf(doc, _html_to_text(html_content))
+
+    doc.save(str(pdf_path))
+    doc.close()
+
+
+_PDF_BACKENDS = {
+    "xhtml2pdf": _pdf_via_xhtml2pdf,
+    "reportlab": _pdf_via_reportlab,
+    "pymupdf": _pdf_via_pymupdf,
+}
+
+# Installed backends, best first; later ones only run if an earlier one fails
+_AVAILABLE_PDF_BACKENDS = tuple(
+    name
+    for name, module in (
+        ("xhtml2pdf", pisa),
+        ("reportlab", SimpleDocTemplate),
+        ("pymupdf", fitz),
+    )
+    if module is not None
+)
+if not _AVAILABLE_PDF_BACKENDS:
+    logger.warning("No PDF backend installed; only HTML output is available")
+
+
+def _generate_pdf(html_content: str, pdf_path: Path, logo_html: str) -> bool:
+    """Generate a PDF with the best installed backend, falling back on errors."""
+    for name in _AVAILABLE_PDF_BACKENDS:
+        try:
+            _PDF_BACKENDS[name](html_content, pdf_path, logo_html)
+        except Exception as e:
+            logger.warning(f"{name} PDF generation failed: {e}")
+            continue
+        logger.info(f"PDF generated using {name}: {pdf_path}")
+        return True
+
+    # All methods failed
+    logger.error("All PDF generation methods failed")
+    return False
+
+
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """
+    Process pool for async PDF rendering, shared by all agents.
+
+    Workers start on the first render rather than when an agent is built, and
+    the pool is shut down at interpreter exit. Where available they come from
+    a forkserver, so they are not forked from a threaded server process.
+    """
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=config.PDF_WORKERS or os.cpu_count(),
+                mp_context=process_pool_context(),
+            )
+            atexit.register(_pdf_pool.shutdown, cancel_futures=True)
+        return _pdf_pool
+
+
+def _discard_pdf_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next render starts a fresh one."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        # Concurrent renders all see the same break; only replace it once
+        if _pdf_pool is pool:
+            _pdf_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _agenerate_pdf(html_content: str, pdf_path: Path, logo_html: str) -> bool:
+    """
+    Render a PDF in the shared process pool.
+
+    A worker that dies (e.g. killed for memory or crashing in a PDF library)
+    breaks the whole pool, so it is replaced and the render retried once. If
+    that fails too the PDF is reported as not generated.
+    """
+    for _ in range(2):
+        pool = _get_pdf_pool()
+        try:
+            return await asyncio.wrap_future(
+                pool.submit(_generate_pdf, html_content, pdf_path, logo_html)
+            )
+        except BrokenProcessPool:
+            logger.warning("PDF worker died, restarting the process pool")
+            _discard_pdf_pool(pool)
+    return False
+
+
+def _write_html(
+    html_path: Path, html_content: str, content: str, write_sidecar: bool
+) -> None:
+    """Write an HTML output, optionally with a plain-text copy of its content."""
+    html_path.write_text(html_content, encoding="utf-8")
+    if write_sidecar:
+        # Lets the web app load the editable text without parsing the HTML
+        html_path.with_suffix(".content.txt").write_text(
+            content.strip(), encoding="utf-8"
+        )
+
+
+class _RateLimiter:
+    """Async token bucket that keeps request starts under a per-minute cap."""
+
+    def __init__(self, requests_per_minute: int):
+        self.capacity = max(1, requests_per_minute)
+        self.tokens = float(self.capacity)
+        self.refill_per_second = self.capacity / 60.0
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request slot is available and consume it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated_at) * self.refill_per_second,
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.refill_per_second)
+
+
+class _CopilotAuth(httpx.Auth):
+    """
+    Attaches the current Copilot token to every request.
+
+    The token cache refreshes the token behind long-lived clients, so it is
+    read per request instead of being fixed when a client is built. A 401
+    drops the cached token and the request is retried once with a new one.
+    """
+
+    def sync_auth_flow(self, request: httpx.Request):
+        token = get_access_token_from_copilot()
+        request.headers["Authorization"] = f"Bearer {token}"
+        response = yield request
+        if response.status_code == 401:
+            logger.info("Copilot token rejected, fetching a new one")
+            invalidate_copilot_token()
+            token = get_access_token_from_copilot()
+            request.headers["Authorization"] = f"Bearer {token}"
+            yield request
+
+    async def async_auth_flow(self, request: httpx.Request):
+        token = await aget_access_token_from_copilot()
+        request.headers["Authorization"] = f"Bearer {token}"
+        response = yield request
+        if response.status_code == 401:
+            logger.info("Copilot token rejected, fetching a new one")
+            invalidate_copilot_token()
+            token = await aget_access_token_from_copilot()
+            request.headers["Authorization"] = f"Bearer {token}"
+            yield request
+
+
+_COPILOT_AUTH = _CopilotAuth()
+
 
 class CVState(TypedDict):
     """State for CV enhancement workflow."""
@@ -36,6 +910,8 @@ class CVState(TypedDict):
     output_path: str
     generate_pdf: bool
     include_logo: bool
+    keep_html_debug: bool
+    write_content_sidecar: bool
 
 
 class CVEnhancementAgent:
@@ -43,8 +919,20 @@ class CVEnhancementAgent:
 
     def __init__(self):
         """Initialize the CV enhancement agent."""
-        self.jinja_env = Environment(
-            loader=FileSystemLoader("templates"), autoescape=True
+        self._async_client: Optional[openai.AsyncOpenAI] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Guards the client/loop pair when several threads run event loops
+        self._async_client_lock = threading.Lock()
+
+        # Logo is resolved once; "" means missing, None means unreadable
+        self._logo_path = str(_LOGO_PATH.absolute())
+        try:
+            self._logo_data: Optional[str] = _read_logo_base64()
+        except Exception as e:
+            logger.warning(f"Could not embed SVG logo: {e}")
+            self._logo_data = None
+        self._logo_html = (
+            _LOGO_IMG_HTML.format(logo_data=self._logo_data) if self._logo_data else ""
         )
         self.workflow = self._build_workflow()
 
@@ -54,8 +942,18 @@ class CVEnhancementAgent:
 
         # Add nodes
         workflow.add_node("load_document", self._load_document_node)
-        workflow.add_node("enhance_content", self._enhance_content_node)
-        workflow.add_node("generate_output", self._generate_output_node)
+        workflow.add_node(
+            "enhance_content",
+            RunnableLambda(
+                self._enhance_content_node, afunc=self._enhance_content_node_async
+            ),
+        )
+        workflow.add_node(
+            "generate_output",
+            RunnableLambda(
+                self._generate_output_node, afunc=self._generate_output_node_async
+            ),
+        )
 
         # Define edges
         workflow.set_entry_point("load_document")
@@ -65,12 +963,16 @@ class CVEnhancementAgent:
 
         return workflow.compile()
 
-    def _load_document_node(self, state: CVState) -> CVState:
+    def _load_document_node(self, state: CVState) -> Dict[str, Any]:
         """Load CV document from file path or URL."""
+        if state.get("cv_content"):
+            # Already loaded up front (batch processing)
+            return {}
+
         try:
             file_type = detect_file_type(state["file_path"])
             documents = load_document(state["file_path"], file_type)
-            cv_content = "\n\n".join([doc.page_content for doc in documents])
+            cv_content = "\n\n".join(doc.page_content for doc in documents)
 
             logger.info(
                 f"Loaded {len(documents)} document(s) from {state['file_path']}"
@@ -81,82 +983,165 @@ class CVEnhancementAgent:
             if not cv_content.strip():
                 logger.warning("Loaded CV content is empty!")
 
-            return {**state, "cv_content": cv_content}
+            return {"cv_content": cv_content}
         except Exception as e:
             logger.error(f"Failed to load document: {e}")
             raise
 
-    def _enhance_content_node(self, state: CVState) -> CVState:
+    def _enhance_content_node(self, state: CVState) -> Dict[str, Any]:
         """Enhance CV content using AI."""
         try:
-            prompt = self._create_enhancement_prompt(
-                state["cv_content"],
-                state["job_description"],
-                state.get("additional_input"),
+            messages = self._build_enhancement_messages(state)
+            response = self._create_completion(
+                messages=messages, **self._sampling_kwargs()
             )
+            choice = response.choices[0]
+            enhanced_content = choice.message.content or ""
+
+            if choice.finish_reason == "length":
+                # Ask once for the rest of a CV that hit the token cap
+                logger.info("Enhanced CV hit the token limit, requesting the rest")
+                response = self._create_completion(
+                    messages=self._continuation_messages(messages, enhanced_content),
+                    **self._sampling_kwargs(),
+                )
+                enhanced_content += response.choices[0].message.content or ""
 
-            client = self._setup_openai_client()
-            response = client.chat.completions.create(
-                model=config.LLM_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert CV enhancement specialist with deep knowledge of recruitment, ATS systems, and professional presentation.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-            )
+            return self._enhanced_content_update(enhanced_content)
 
-            enhanced_content = response.choices[0].message.content
-            if not enhanced_content:
-                raise ValueError("Empty response from AI model")
+        except Exception as e:
+            logger.error(f"Content enhancement failed: {e}")
+            raise
 
-            logger.info(
-                f"CV enhancement completed successfully (length: {len(enhanced_content)} chars)"
-            )
-            logger.debug(f"Enhanced content preview: {enhanced_content[:200]}...")
+    async def _enhance_content_node_async(self, state: CVState) -> Dict[str, Any]:
+        """Enhance CV content using AI, streaming the response asynchronously."""
+        try:
+            messages = self._build_enhancement_messages(state)
+            enhanced_content, finish_reason = await self._astream_completion(messages)
+
+            if finish_reason == "length":
+                logger.info("Enhanced CV hit the token limit, requesting the rest")
+                rest, _ = await self._astream_completion(
+                    self._continuation_messages(messages, enhanced_content)
+                )
+                enhanced_content += rest
 
-            return {**state, "enhanced_content": enhanced_content}
+            return self._enhanced_content_update(enhanced_content)
 
         except Exception as e:
             logger.error(f"Content enhancement failed: {e}")
             raise
 
-    def _generate_output_node(self, state: CVState) -> CVState:
-        """Generate final resume file (HTML/PDF)."""
-        try:
-            # Debug: Check if enhanced content exists
-            if not state.get("enhanced_content", "").strip():
-                logger.error(
-                    "Enhanced content is empty! Using original CV content as fallback."
-                )
-                # Fallback to original content if enhancement failed
-                content_to_use = state.get("cv_content", "No content available")
-            else:
-                content_to_use = state["enhanced_content"]
-                logger.info(
-                    f"Using enhanced content (length: {len(content_to_use)} chars)"
-                )
+    async def _astream_completion(
+        self, messages: List[Dict[str, str]]
+    ) -> Tuple[str, Optional[str]]:
+        """Stream a completion and return its text and finish reason."""
+        stream = await self._acreate_completion(
+            messages=messages, stream=True, **self._sampling_kwargs()
+        )
 
-            # Get logo path if needed
-            logo_path = None
-            if state.get("include_logo", True):
-                logo_path = os.path.join(os.getcwd(), "assets", "brainium-logo.svg")
-
-            # Generate HTML content
-            template = self.jinja_env.get_template("resume_template.md")
-            html_content = template.render(
-                cv_content=content_to_use,
-                logo_path=logo_path,
-                include_logo=state.get("include_logo", True),
-            )
+        parts = []
+        finish_reason = None
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            if choice.delta.content:
+                parts.append(choice.delta.content)
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+
+        return "".join(parts), finish_reason
+
+    def _sampling_kwargs(self, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Model and sampling limits for an enhancement request."""
+        return {
+            "model": config.LLM_MODEL,
+            "max_tokens": max_tokens or config.LLM_MAX_TOKENS,
+            "temperature": config.LLM_TEMPERATURE,
+            "top_p": config.LLM_TOP_P,
+        }
 
-            output_path = Path(state["output_path"])
+    def _continuation_messages(
+        self, messages: List[Dict[str, str]], partial: str
+    ) -> List[Dict[str, str]]:
+        """Messages asking the model to finish a truncated answer."""
+        return messages + [
+            {"role": "assistant", "content": partial},
+            {"role": "user", "content": _CONTINUE_PROMPT},
+        ]
+
+    def _build_enhancement_messages(self, state: CVState) -> List[Dict[str, str]]:
+        """Build the chat messages for the enhancement request."""
+        prompt = self._create_enhancement_prompt(
+            state["cv_content"],
+            state["job_description"],
+            state.get("additional_input"),
+        )
+        return [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ]
+
+    def _enhanced_content_update(
+        self, enhanced_content: Optional[str]
+    ) -> Dict[str, Any]:
+        """Validate the model output and return it as a state update."""
+        if not enhanced_content:
+            raise ValueError("Empty response from AI model")
+
+        logger.info(
+            f"CV enhancement completed successfully (length: {len(enhanced_content)} chars)"
+        )
+        logger.debug(f"Enhanced content preview: {enhanced_content[:200]}...")
 
-            # Always create HTML first for debugging
-            html_path = output_path.with_suffix(".html")
-            html_path.write_text(html_content, encoding="utf-8")
-            logger.info(f"HTML file created: {html_path}")
+        return {"enhanced_content": enhanced_content}
+
+    async def _aenhance_packed(self, states: List[CVState]) -> List[Optional[str]]:
+        """
+        Enhance several CVs sharing one job description with a single LLM call.
+
+        Returns:
+            Enhanced content per state, or None where the response had no
+            usable entry for that CV
+        """
+        prompt = self._create_batch_enhancement_prompt(
+            [state["cv_content"] for state in states],
+            states[0]["job_description"],
+            states[0].get("additional_input"),
+        )
+        # A truncated JSON reply is unusable, so budget for every packed CV,
+        # up to what the model can emit in one response
+        max_tokens = min(
+            config.LLM_MAX_TOKENS * len(states), config.LLM_MAX_OUTPUT_TOKENS
+        )
+        response = await self._acreate_completion(
+            messages=[
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            response_format={"type": "json_object"},
+            **self._sampling_kwargs(max_tokens),
+        )
+
+        try:
+            payload = json.loads(response.choices[0].message.content or "")
+            items = payload.get("results", [])
+        except (ValueError, AttributeError) as e:
+            logger.warning(f"Could not parse batched enhancement response: {e}")
+            return [None] * len(states)
+
+        # JSON mode may echo ids as strings, so compare them as strings
+        enhanced: Dict[str, str] = {}
+        for item in items:
+            if isinstance(item, dict) and isinstance(item.get("cv"), str):
+                enhanced[str(item.get("id"))] = item["cv"]
+        return [enhanced.get(str(cv_id)) or None for cv_id in range(len(states))]
+
+    def _generate_output_node(self, state: CVState) -> Dict[str, Any]:
+        """Generate final resume file (HTML/PDF)."""
+        try:
+            html_content, output_path, content = self._render_output(state)
 
             if state.get("generate_pdf", False):
                 # Generate PDF with multiple fallback options
@@ -164,575 +1149,513 @@ class CVEnhancementAgent:
                 pdf_generated = self._generate_pdf_with_fallbacks(
                     html_content, pdf_path, state
                 )
+                self._report_pdf(pdf_generated, html_content, content, state)
 
-                if pdf_generated:
-                    logger.info(f"PDF successfully generated: {pdf_path}")
-                else:
-                    logger.warning(f"PDF generation failed, using HTML: {html_path}")
-
-            return state
+            # Nothing to merge back into the workflow state
+            return {}
 
         except Exception as e:
             logger.error(f"Output generation failed: {e}")
             raise
 
-    def _generate_pdf_with_fallbacks(
-        self, html_content: str, pdf_path: Path, state: CVState
-    ) -> bool:
-        """Generate PDF using multiple methods with fallbacks."""
-
-        # Method 1: Try markdown + xhtml2pdf (clean and simple) - Primary method
+    async def _generate_output_node_async(self, state: CVState) -> Dict[str, Any]:
+        """Async output node; the PDF is rendered in the shared process pool."""
         try:
-            import os
-
-            import markdown
-            from xhtml2pdf import pisa
-
-            logger.info("Using markdown + xhtml2pdf for clean PDF generation")
-
-            # Extract and convert HTML content to markdown
-            markdown_content = self._html_to_markdown(html_content)
+            html_content, output_path, content = self._render_output(state)
 
-            # Convert markdown to HTML with proper extensions
-            html = markdown.markdown(
-                markdown_content,
-                extensions=["tables", "fenced_code", "nl2br", "sane_lists"],
-            )
+            if state.get("generate_pdf", False):
+                pdf_path = output_path.with_suffix(".pdf")
+                pdf_generated = await _agenerate_pdf(
+                    html_content, pdf_path, self._state_logo_html(state)
+                )
+                self._report_pdf(pdf_generated, html_content, content, state)
 
-            # Check if logo should be included
-            logo_html = ""
-            if state.get("include_logo", False):
-                logo_path = os.path.join(os.getcwd(), "assets", "brainium-logo.svg")
-                if os.path.exists(logo_path):
-                    try:
-                        # Try to convert SVG to base64 for embedding
-                        import base64
-
-                        with open(logo_path, "rb") as logo_file:
-                            logo_data = base64.b64encode(logo_file.read()).decode(
-                                "utf-8"
-                            )
-                            logo_html = f"""
-                            <div style="text-align: center; margin-bottom: 20px;">
-                                <img src="data:image/svg+xml;base64,{logo_data}" alt="Brainium Logo" style="max-width: 150px; height: auto; display: block; margin: 0 auto;">
-                            </div>
-                            """
-                            logger.info("Logo embedded as base64")
-                    except Exception as e:
-                        logger.warning(f"Could not embed SVG logo: {e}")
-                        # Fallback to text logo
-                        logo_html = """
-                        <div style="text-align: left; margin-bottom: 20px; border-bottom: 1px solid #e0e0e0; padding-bottom: 15px;">
-                            <div style="font-size: 18px; font-weight: bold; color: #cc0000;">BRAINIUM</div>
-                        </div>
-                        """
-                        logger.info("Using text logo as fallback")
-
-            # Add CSS styling for better PDF formatting with per-page logo frames
-            styled_html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <style>
-                    @page {{
-                        size: a4 portrait;
-                        @frame header_frame {{           /* Static Frame */
-                            -pdf-frame-content: header_content;
-                            left: 50pt; width: 512pt; top: 50pt; height: 60pt;
-                        }}
-                        @frame content_frame {{          /* Content Frame */
-                            left: 50pt; width: 512pt; top: 120pt; height: 602pt;
-                        }}
-                        @frame footer_frame {{           /* Another static Frame */
-                            -pdf-frame-content: footer_content;
-                            left: 50pt; width: 512pt; top: 772pt; height: 20pt;
-                        }}
-                    }}
-                    body {{
-                        font-family: Arial, sans-serif;
-                        line-height: 1.4;
-                        color: #000000;
-                        margin: 0;
-                        padding: 0;
-                        font-size: 15px;
-                    }}
-                    #header_content {{
-                        -pdf-frame-content: header_content;
-                        text-align: center;
-                        padding-bottom: 5px;
-                    }}
-                    #footer_content {{
-                        -pdf-frame-content: footer_content;
-                    }}
-                    h1, h2, h3, h4, h5, h6 {{
-                        color: #000000;
-                        margin-top: 15px;
-                        margin-bottom: 8px;
-                        font-size: 15px;
-                    }}
-                    h1 {{
-                        font-size: 15px;
-                        text-align: right;
-                        margin-top: 0;
-                        margin-bottom: 2px;
-                    }}
-                    h2 {{
-                        font-size: 15px;
-                        text-align: right;
-                        margin-top: 2px;
-                        margin-bottom: 15px;
-                        border-bottom: 1px solid #cccccc;
-                        padding-bottom: 2px;
-                    }}
-                    h3 {{
-                        font-size: 15px;
-                        margin-top: 20px;
-                        margin-bottom: 10px;
-                        text-decoration: underline;
-                    }}
-                    p {{
-                        font-size: 15px;
-                    }}
-                    li {{
-                        font-size: 15px;
-                    }}
-                    ul, ol {{
-                        margin: 5px 0;
-                        padding-left: 20px;
-                    }}
-                    li {{
-                        margin: 2px 0;
-                        line-height: 1.3;
-                    }}
-                    ul li {{
-                        list-style-type: disc;
-                    }}
-                    ul li ul li {{
-                        list-style-type: circle;
-                    }}
-                    p {{
-                        margin: 5px 0;
-                    }}
-                    strong {{
-                        color: #333333;
-                    }}
-                    code {{
-                        background-color: #f8f9fa;
-                        padding: 2px 4px;
-                        border-radius: 3px;
-                        font-family: monospace;
-                    }}
-                </style>
-            </head>
-            <body>
-            <!-- Header content for every page -->
-            <div id="header_content">
-                {logo_html.replace('style="max-width: 150px; height: auto;"', 'style="max-width: 80px; height: auto;"')}
-            </div>
-            
-            <!-- Footer content for every page -->
-            <div id="footer_content">
-                <!-- Optional footer content -->
-            </div>
-            
-            <!-- Main content goes in content frame -->
-            {html}
-            </body>
-            </html>
-            """
-
-            with open(pdf_path, "wb") as f:
-                pisa.CreatePDF(styled_html, dest=f)
-
-            logger.info(f"PDF generated using markdown + xhtml2pdf: {pdf_path}")
-            return True
+            return {}
 
         except Exception as e:
-            logger.warning(f"markdown + xhtml2pdf generation failed: {e}")
-
-        # Method 2: Try reportlab (pure Python PDF generation) - Fallback method
-        try:
-            from reportlab.lib.pagesizes import letter
-            from reportlab.lib.styles import getSampleStyleSheet
-            from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
-
-            # Create PDF using reportlab
-            doc = SimpleDocTemplate(
-                str(pdf_path),
-                pagesize=letter,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=18,
-            )
-            styles = getSampleStyleSheet()
+            logger.error(f"Output generation failed: {e}")
+            raise
 
-            # Extract and process enhanced content (not HTML template)
-            enhanced_content = self._extract_enhanced_content(html_content)
+    def _render_output(self, state: CVState) -> Tuple[str, Path, str]:
+        """
+        Render the resume HTML, writing the HTML file when it is wanted.
 
-            # Create story (content) for PDF
-            story = []
+        Returns:
+            The HTML, the output path and the CV text that was rendered
+        """
+        # Debug: Check if enhanced content exists
+        if not state.get("enhanced_content", "").strip():
+            logger.error(
+                "Enhanced content is empty! Using original CV content as fallback."
+            )
+            # Fallback to original content if enhancement failed
+            content_to_use = state.get("cv_content", "No content available")
+        else:
+            content_to_use = state["enhanced_content"]
+            logger.info(f"Using enhanced content (length: {len(content_to_use)} chars)")
+
+        # Get logo path if needed
+        logo_path = self._logo_path if state.get("include_logo", True) else None
+
+        # Generate HTML content
+        template = _get_template("resume_template.md")
+        html_content = template.render(
+            cv_content=content_to_use,
+            logo_path=logo_path,
+            include_logo=state.get("include_logo", True),
+        )
 
-            # Process content line by line
-            lines = enhanced_content.split("\n")
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    story.append(Spacer(1, 6))
-                    continue
-
-                # Detect different content types
-                if line.startswith("**") and line.endswith("**"):
-                    # Bold headers
-                    header_text = line.replace("**", "").strip()
-                    if len(header_text) < 30:  # Short headers = main titles
-                        story.append(Paragraph(header_text, styles["Title"]))
-                    else:  # Longer headers = subtitles
-                        story.append(Paragraph(header_text, styles["Heading1"]))
-                elif line.startswith("---"):
-                    # Separators
-                    story.append(Spacer(1, 12))
-                elif line.startswith("- "):
-                    # Bullet points
-                    bullet_text = line[2:]  # Remove '- '
-                    story.append(Paragraph(f"• {bullet_text}", styles["Normal"]))
-                elif (
-                    line.replace(" ", "").replace("-", "").replace("_", "").isalnum()
-                    and len(line) < 50
-                ):
-                    # Section headers (short lines, mostly alphanumeric)
-                    story.append(Paragraph(line, styles["Heading2"]))
-                else:
-                    # Regular text
-                    story.append(Paragraph(line, styles["Normal"]))
-
-                story.append(Spacer(1, 6))
-
-            doc.build(story)
-
-            logger.info(f"PDF generated using reportlab: {pdf_path}")
-            return True
+        output_path = Path(state["output_path"])
 
-        except Exception as e:
-            logger.warning(f"reportlab failed: {e}")
+        # HTML is the deliverable only when no PDF is requested
+        keep_html = state.get("keep_html_debug", False)
+        if keep_html or not state.get("generate_pdf", False):
+            html_path = output_path.with_suffix(".html")
+            _write_html(
+                html_path,
+                html_content,
+                content_to_use,
+                state.get("write_content_sidecar", False),
+            )
+            logger.info(f"HTML file created: {html_path}")
 
-        # Method 3: Try PyMuPDF (fallback)
-        try:
-            import fitz  # PyMuPDF
+        return html_content, output_path, content_to_use
+
+    def _report_pdf(
+        self, pdf_generated: bool, html_content: str, content: str, state: CVState
+    ) -> None:
+        """Log the PDF outcome, leaving the HTML behind if the PDF failed."""
+        html_path = Path(state["output_path"]).with_suffix(".html")
+        if pdf_generated:
+            logger.info(f"PDF successfully generated: {html_path.with_suffix('.pdf')}")
+            return
+
+        if not html_path.exists():
+            _write_html(
+                html_path,
+                html_content,
+                content,
+                state.get("write_content_sidecar", False),
+            )
+        logger.warning(f"PDF generation failed, using HTML: {html_path}")
 
-            # Create a simple PDF with formatted text
-            doc = fitz.open()  # create new PDF
-            page = doc.new_page()  # type: ignore  # Create a new page (PyMuPDF method)
+    def _generate_pdf_with_fallbacks(
+        self, html_content: str, pdf_path: Path, state: CVState
+    ) -> bool:
+        """Generate PDF using the installed backends with fallbacks."""
+        return _generate_pdf(html_content, pdf_path, self._state_logo_html(state))
+
+    def _state_logo_html(self, state: CVState) -> str:
+        """Logo markup for a workflow PDF, empty when the logo is disabled."""
+        if not state.get("include_logo", False):
+            return ""
+        return self._pdf_logo_html(_PDF_TEXT_LOGO_HTML)
+
+    def _pdf_logo_html(self, text_fallback: str) -> str:
+        """Logo markup for PDFs, or the text fallback if the SVG was unreadable."""
+        if self._logo_data is None:
+            logger.info("Using text logo as fallback")
+            return text_fallback
+        return self._logo_html
+
+    def _openai_client_kwargs(self) -> Dict[str, Any]:
+        """Connection settings shared by the sync and async OpenAI clients."""
+        return {
+            # Placeholder; _CopilotAuth sets the real token on each request
+            "api_key": "copilot",
+            "base_url": config.LLM_BASE_URL,
+            "default_headers": {
+                "editor-version": "vscode/1.104.0",
+                "editor-plugin-verion": "copilot.vim/1.16.0",
+                "user-agent": "GithubCopilot/1.155.0",
+            },
+        }
 
-            # Extract and clean text content from HTML
-            text_content = self._html_to_text(html_content)
+    @cached_property
+    def _openai_client(self) -> openai.OpenAI:
+        """OpenAI client reused across requests."""
+        return openai.OpenAI(
+            http_client=openai.DefaultHttpxClient(auth=_COPILOT_AUTH),
+            **self._openai_client_kwargs(),
+        )
 
-            # Format the text nicely in the PDF
-            self._add_formatted_text_to_pdf(page, text_content)
+    async def _aget_openai_client(self) -> openai.AsyncOpenAI:
+        """Return the AsyncOpenAI client, rebuilding it for a new event loop."""
+        # httpx connection pools are bound to the loop that created them
+        loop = asyncio.get_running_loop()
+        client = self._async_client
+        if client is not None and self._async_client_loop is loop:
+            return client
+
+        with self._async_client_lock:
+            if self._async_client is not None and self._async_client_loop is loop:
+                # Another thread built it while we waited for the lock
+                return self._async_client
+            stale = (self._async_client, self._async_client_loop)
+            # Concurrent batch requests share a few multiplexed connections
+            http_client = openai.DefaultAsyncHttpxClient(
+                http2=_HTTP2,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                auth=_COPILOT_AUTH,
+            )
+            client = openai.AsyncOpenAI(
+                http_client=http_client, **self._openai_client_kwargs()
+            )
+            self._async_client = client
+            self._async_client_loop = loop
+        self._close_async_client(*stale)
+        return client
+
+    @staticmethod
+    def _close_async_client(
+        client: Optional[openai.AsyncOpenAI],
+        loop: Optional[asyncio.AbstractEventLoop],
+    ) -> None:
+        """Close a replaced client on the event loop that owns its connections."""
+        # A closed loop has already dropped the connections it owned
+        if client is not None and loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.close(), loop)
+
+    async def _aclose_async_client(self) -> None:
+        """Close the async client if it belongs to the running event loop."""
+        with self._async_client_lock:
+            if self._async_client_loop is not asyncio.get_running_loop():
+                return
+            client = self._async_client
+            self._async_client = self._async_client_loop = None
+        if client is not None:
+            await client.close()
+
+    def _create_completion(self, **kwargs):
+        """Create a chat completion on the shared client."""
+        return self._openai_client.chat.completions.create(**kwargs)
+
+    async def _acreate_completion(self, **kwargs):
+        """Async version of _create_completion."""
+        client = await self._aget_openai_client()
+        return await client.chat.completions.create(**kwargs)
+
+    def _format_additional_context(
+        self, additional_input: Optional[Union[str, Dict]]
+    ) -> str:
+        """Render optional additional input as a prompt section."""
+        if additional_input:
+            if isinstance(additional_input, str):
+                return f"\n\nAdditional Context:\n{additional_input}"
+            elif isinstance(additional_input, dict):
+                return (
+                    f"\n\nAdditional Context:\n{json.dumps(additional_input, indent=2)}"
+                )
+        return ""
 
-            doc.save(str(pdf_path))
-            doc.close()
+    def _create_enhancement_prompt(
+        self,
+        cv_content: str,
+        job_description: str,
+        additional_input: Optional[Union[str, Dict]] = None,
+    ) -> str:
+        """Create comprehensive prompt for CV enhancement."""
+        return _ENHANCEMENT_PROMPT.substitute(
+            cv_content=cv_content,
+            job_description=job_description,
+            additional_context=self._format_additional_context(additional_input),
+        )
 
-            logger.info(f"PDF generated using PyMuPDF: {pdf_path}")
-            return True
+    def _create_batch_enhancement_prompt(
+        self,
+        cvs: List[str],
+        job_description: str,
+        additional_input: Optional[Union[str, Dict]] = None,
+    ) -> str:
+        """Create a prompt that enhances several CVs in one JSON response."""
+        return _BATCH_ENHANCEMENT_PROMPT.substitute(
+            count=len(cvs),
+            cvs="\n\n".join(
+                f"=== CV id: {cv_id} ===\n{cv}" for cv_id, cv in enumerate(cvs)
+            ),
+            job_description=job_description,
+            additional_context=self._format_additional_context(additional_input),
+        )
 
-        except Exception as e:
-            logger.warning(f"PyMuPDF failed: {e}")
+    def process_cv_enhancement(
+        self,
+        cv_file_path: str,
+        job_description: str,
+        additional_input: Optional[Union[str, Dict]] = None,
+        output_path: str = "resume.html",
+        generate_pdf: bool = True,
+        include_logo: bool = True,
+        keep_html_debug: bool = False,
+        write_content_sidecar: bool = False,
+    ) -> str:
+        """
+        Process CV enhancement using LangGraph workflow.
 
-        # All methods failed
-        logger.error("All PDF generation methods failed")
-        return False
+        Args:
+            cv_file_path: Path to CV file or Adobe Express URL
+            job_description: Job description for alignment
+            additional_input: Optional additional context
+            output_path: Output path for enhanced resume
+            keep_html_debug: Also write the HTML file when generating a PDF
+            write_content_sidecar: Write the CV text to a ".content.txt" file
+                next to any HTML written, so it can be edited without parsing
 
-    def _extract_enhanced_content(self, html_content: str) -> str:
-        """Extract just the enhanced CV content from HTML template."""
-        import re
+        Returns:
+            Path to generated enhanced resume file
+        """
+        logger.info(f"Starting CV enhancement workflow for: {cv_file_path}")
 
-        # Find content between <div class="content"> tags
-        content_match = re.search(
-            r'<div class="content">\s*(.*?)\s*</div>',
-            html_content,
-            re.DOTALL | re.IGNORECASE,
-        )
-        if content_match:
-            return content_match.group(1).strip()
-
-        # Fallback: extract content after </style> and before </body>
-        style_end = html_content.find("</style>")
-        body_end = html_content.find("</body>")
-        if style_end != -1 and body_end != -1:
-            content_section = html_content[style_end + 8 : body_end]
-            # Remove HTML tags but keep the enhanced content
-            content_section = re.sub(r"<[^>]+>", "", content_section)
-            return content_section.strip()
-
-        # Last resort: return original content
-        return self._html_to_text(html_content)
-
-    def _html_to_text(self, html_content: str) -> str:
-        """Convert HTML content to clean text."""
-        import re
-
-        # Remove HTML tags but preserve structure
-        text = html_content
-
-        # Convert common HTML elements to text
-        text = re.sub(
-            r"<h[1-6][^>]*>(.*?)</h[1-6]>",
-            r"\n\1\n",
-            text,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-        text = re.sub(
-            r"<p[^>]*>(.*?)</p>", r"\n\1\n", text, flags=re.IGNORECASE | re.DOTALL
+        initial_state = self._initial_state(
+            cv_file_path,
+            job_description,
+            additional_input,
+            output_path,
+            generate_pdf,
+            include_logo,
+            keep_html_debug,
+            write_content_sidecar,
         )
-        text = re.sub(
-            r"<li[^>]*>(.*?)</li>", r"• \1\n", text, flags=re.IGNORECASE | re.DOTALL
-        )
-        text = re.sub(r"<br[^>]*>", "\n", text, flags=re.IGNORECASE)
-        text = re.sub(
-            r"<strong[^>]*>(.*?)</strong>", r"\1", text, flags=re.IGNORECASE | re.DOTALL
-        )
-        text = re.sub(
-            r"<b[^>]*>(.*?)</b>", r"\1", text, flags=re.IGNORECASE | re.DOTALL
-        )
-
-        # Remove remaining HTML tags
-        text = re.sub(r"<[^>]+>", "", text)
 
-        # Clean up whitespace
-        text = re.sub(r"\n\s*\n", "\n\n", text)  # Multiple newlines to double
-        text = re.sub(r"[ \t]+", " ", text)  # Multiple spaces to single
-        text = text.strip()
+        # Run workflow
+        self.workflow.invoke(initial_state)
 
-        return text
+        logger.info(f"CV enhancement workflow completed: {output_path}")
+        return str(Path(output_path).absolute())
 
-    def _html_to_markdown(self, html_content: str) -> str:
-        """Convert HTML content to clean markdown."""
+    async def aprocess_cv_enhancement(
+        self,
+        cv_file_path: str,
+        job_description: str,
+        additional_input: Optional[Union[str, Dict]] = None,
+        output_path: str = "resume.html",
+        generate_pdf: bool = True,
+        include_logo: bool = True,
+        keep_html_debug: bool = False,
+        write_content_sidecar: bool = False,
+    ) -> str:
+        """
+        Async version of process_cv_enhancement.
 
-        # First extract the enhanced content
-        enhanced_content = self._extract_enhanced_content(html_content)
+        The LLM call is streamed through AsyncOpenAI, so several CVs can be
+        processed concurrently on one event loop.
 
-        # If it's already mostly markdown-like, return it
-        if "<" not in enhanced_content:
-            return enhanced_content
+        Returns:
+            Path to generated enhanced resume file
+        """
+        logger.info(f"Starting async CV enhancement workflow for: {cv_file_path}")
+
+        initial_state = self._initial_state(
+            cv_file_path,
+            job_description,
+            additional_input,
+            output_path,
+            generate_pdf,
+            include_logo,
+            keep_html_debug,
+            write_content_sidecar,
+        )
 
-        import re
+        return await self._arun_workflow(initial_state)
 
-        # Convert HTML to markdown
-        markdown = enhanced_content
+    async def _arun_workflow(self, state: CVState) -> str:
+        """Run the workflow asynchronously and return the output path."""
+        await self.workflow.ainvoke(state)
 
-        # Convert headers
-        markdown = re.sub(
-            r"<h1[^>]*>(.*?)</h1>", r"# \1", markdown, flags=re.IGNORECASE | re.DOTALL
-        )
-        markdown = re.sub(
-            r"<h2[^>]*>(.*?)</h2>", r"## \1", markdown, flags=re.IGNORECASE | re.DOTALL
-        )
-        markdown = re.sub(
-            r"<h3[^>]*>(.*?)</h3>", r"### \1", markdown, flags=re.IGNORECASE | re.DOTALL
-        )
-        markdown = re.sub(
-            r"<h4[^>]*>(.*?)</h4>",
-            r"#### \1",
-            markdown,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
+        logger.info(f"CV enhancement workflow completed: {state['output_path']}")
+        return str(Path(state["output_path"]).absolute())
 
-        # Convert paragraphs
-        markdown = re.sub(
-            r"<p[^>]*>(.*?)</p>", r"\1\n", markdown, flags=re.IGNORECASE | re.DOTALL
-        )
+    async def abatch_process_cv_enhancement(
+        self,
+        jobs: List[Dict[str, Any]],
+        max_concurrency: int = 16,
+        requests_per_minute: int = 500,
+        batch_size: int = 1,
+    ) -> List[Union[str, Exception]]:
+        """
+        Enhance several CVs concurrently.
 
-        # Convert lists
-        markdown = re.sub(r"<ul[^>]*>", "", markdown, flags=re.IGNORECASE)
-        markdown = re.sub(r"</ul>", "", markdown, flags=re.IGNORECASE)
-        markdown = re.sub(
-            r"<li[^>]*>(.*?)</li>", r"- \1", markdown, flags=re.IGNORECASE | re.DOTALL
-        )
+        Args:
+            jobs: Keyword arguments for aprocess_cv_enhancement, one dict per CV.
+                Each job should use its own output_path.
+            max_concurrency: Maximum number of LLM requests in flight at once
+            requests_per_minute: Upper bound on LLM requests started per minute
+            batch_size: When greater than 1, CVs sharing the same job description
+                and additional input are packed up to this many per LLM request
+                (5-10 is a good range)
 
-        # Convert bold/strong
-        markdown = re.sub(
-            r"<(strong|b)[^>]*>(.*?)</(strong|b)>",
-            r"**\2**",
-            markdown,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
+        Returns:
+            Result path per job, in order; failed jobs hold their exception
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        limiter = _RateLimiter(requests_per_minute)
 
-        # Convert italic/em
-        markdown = re.sub(
-            r"<(em|i)[^>]*>(.*?)</(em|i)>",
-            r"*\2*",
-            markdown,
-            flags=re.IGNORECASE | re.DOTALL,
+        logger.info(f"Starting batch CV enhancement for {len(jobs)} CV(s)")
+        states = [self._initial_state(**job) for job in jobs]
+        results: List[Union[str, Exception, None]] = list(
+            await self._apreload_documents(states)
         )
+        pending = [index for index, failure in enumerate(results) if failure is None]
 
-        # Convert breaks
-        markdown = re.sub(r"<br[^>]*>", "\n", markdown, flags=re.IGNORECASE)
-
-        # Remove remaining HTML tags
-        markdown = re.sub(r"<[^>]+>", "", markdown)
+        if batch_size > 1:
+            await self._abatch_process_packed(
+                states, pending, results, batch_size, semaphore, limiter
+            )
+        else:
 
-        # Clean up whitespace
-        # Multiple newlines to double
-        markdown = re.sub(r"\n\s*\n", "\n\n", markdown)
-        # Multiple spaces to single
-        markdown = re.sub(r"[ \t]+", " ", markdown)
-        markdown = markdown.strip()
+            async def run(index: int) -> str:
+                async with semaphore:
+                    await limiter.acquire()
+                    return await self._arun_workflow(states[index])
 
-        return markdown
+            outcomes = await asyncio.gather(
+                *(run(index) for index in pending), return_exceptions=True
+            )
+            for index, outcome in zip(pending, outcomes):
+                results[index] = outcome
 
-    def _add_formatted_text_to_pdf(self, page, text_content: str):
-        """Add formatted text to PDF page using PyMuPDF."""
+        for job, result in zip(jobs, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Batch enhancement failed for {job.get('cv_file_path')}: {result}"
+                )
+        return results
 
-        font_size = 11
-        line_height = 14
-        margin = 72  # 1 inch
-        page_width = page.rect.width
-        page_height = page.rect.height
+    async def _apreload_documents(
+        self, states: List[CVState]
+    ) -> List[Optional[Exception]]:
+        """
+        Load every CV of a batch concurrently via load_document_batch.
 
-        lines = text_content.split("\n")
-        y_position = page_height - margin
+        Loaded content is stored on each state so the workflow skips loading.
 
-        for line in lines:
-            line = line.strip()
-            if not line:
-                y_position -= line_height * 0.5  # Smaller space for empty lines
+        Returns:
+            None per successfully loaded state, otherwise the load error
+        """
+        if not states:
+            return []
+
+        failures: List[Optional[Exception]] = [None] * len(states)
+        items = []
+        indices = []
+        for index, state in enumerate(states):
+            try:
+                file_type = detect_file_type(state["file_path"])
+            except ValueError as e:
+                failures[index] = e
                 continue
+            items.append((state["file_path"], file_type))
+            indices.append(index)
+
+        outcomes = await asyncio.to_thread(
+            load_document_batch,
+            items,
+            config.DOC_LOAD_WORKERS or None,
+            return_exceptions=True,
+        )
 
-            # Check if it's a header (all caps or short line)
-            if line.isupper() or len(line) < 50:
-                current_font_size = font_size + 2
-                # Use flags if available, otherwise skip
-                try:
-                    pass
-                except AttributeError:
-                    pass
+        for index, outcome in zip(indices, outcomes):
+            if isinstance(outcome, Exception):
+                failures[index] = outcome
             else:
-                current_font_size = font_size
-
-            # Word wrap long lines
-            words = line.split()
-            current_line = ""
-
-            for word in words:
-                test_line = current_line + (" " if current_line else "") + word
-
-                # Estimate text width (simple approach)
-                char_width = current_font_size * 0.6  # Approximate character width
-                text_width = len(test_line) * char_width
-
-                if text_width < (page_width - 2 * margin):
-                    current_line = test_line
-                else:
-                    # Print current line and start new one
-                    if current_line:
-                        if y_position < margin:  # Start new page if needed
-                            break
-                        page.insert_text(
-                            (margin, y_position),
-                            current_line,
-                            fontsize=current_font_size,
-                        )
-                        y_position -= line_height
-                    current_line = word
-
-            # Print the last line
-            if current_line and y_position >= margin:
-                page.insert_text(
-                    (margin, y_position), current_line, fontsize=current_font_size
-                )
-                y_position -= line_height * 1.2  # Extra space after paragraphs
+                cv_content = "\n\n".join(doc.page_content for doc in outcome)
+                states[index] = {**states[index], "cv_content": cv_content}
 
-    def _setup_openai_client(self) -> openai.OpenAI:
-        """Setup OpenAI client with Copilot token."""
-        token = get_access_token_from_copilot()
-        return openai.OpenAI(
-            api_key=token,
-            base_url=config.LLM_BASE_URL,
-            default_headers={
-                "editor-version": "vscode/1.104.0",
-                "editor-plugin-verion": "copilot.vim/1.16.0",
-                "user-agent": "GithubCopilot/1.155.0",
-            },
-        )
+        for state, failure in zip(states, failures):
+            if failure is not None:
+                logger.error(
+                    f"Failed to load document {state['file_path']}: {failure}"
+                )
+        return failures
 
-    def _create_enhancement_prompt(
+    def batch_process_cv_enhancement(
         self,
-        cv_content: str,
-        job_description: str,
-        additional_input: Optional[Union[str, Dict]] = None,
-    ) -> str:
-        """Create comprehensive prompt for CV enhancement."""
-
-        additional_context = ""
-        if additional_input:
-            if isinstance(additional_input, str):
-                additional_context = f"\n\nAdditional Context:\n{additional_input}"
-            elif isinstance(additional_input, dict):
-                additional_context = (
-                    f"\n\nAdditional Context:\n{json.dumps(additional_input, indent=2)}"
+        jobs: List[Dict[str, Any]],
+        max_concurrency: int = 16,
+        requests_per_minute: int = 500,
+        batch_size: int = 1,
+    ) -> List[Union[str, Exception]]:
+        """Blocking wrapper around abatch_process_cv_enhancement."""
+
+        async def run_batch() -> List[Union[str, Exception]]:
+            try:
+                return await self.abatch_process_cv_enhancement(
+                    jobs, max_concurrency, requests_per_minute, batch_size
                 )
+            finally:
+                # The private loop ends here, so release its connections
+                await self._aclose_async_client()
 
-        return f"""You are an expert CV enhancement specialist. Transform the provided CV to align with the job description while maintaining authenticity.
-
-## Enhancement Requirements:
-
-### 1. Header & Name Formatting
-- Start with the candidate's name as the MAIN HEADER (use # in markdown). First name full and then Initial (Example: Satadeep Dasgupta -> Satadeep D).
-- Follow with job title/role (use ## in markdown)
-- Do NOT include any contact information, addresses, emails, or phone numbers
-- Keep the header clean and professional
-
-### 2. Section Structure (Use these EXACT section titles with ### headers):
-- Professional Summary:
-- Core Technical Skills:
-- Professional Experience:
-- Education:
-
-### 3. Text Formatting Guidelines
-- Use **bold** for ALL technical skills (programming languages, frameworks, tools, technologies)
-- Use **bold** for job titles/positions and company types
-- Use **bold** for key achievements and quantifiable metrics (numbers, percentages, results)
-- Use **bold** for important keywords that match the job description
-- Use **bold** for certifications, degrees, and qualifications
-- Format all bullet points with proper markdown bullets (- or •)
-- Make every technical term, tool, and skill name **bold** to stand out
-
-### 4. JD Alignment & Content Refinement
-- Analyze job requirements and optimize CV content accordingly
-- Add missing elements that align with job requirements (realistically)
-- Optimize keywords for ATS compatibility
-- Enhance achievements with quantifiable results
-
-### 5. Anonymization
-- Remove ALL company names - Only current company should be Brainium Information Technologies Pvt Ltd
-- Remove ALL personal contact details (email, phone, address, college name or school name)
-- Maintain role context without revealing specific organizations
-
-### 6. Portfolio & Project Enhancement
-- Expand project descriptions with technical details
-- Add relevant tech stacks and methodologies
-- Include project scope and business impact with metrics
-- Add modern technologies that align with the JD (realistically)
+        # uvloop only drives this private loop; it is never installed globally
+        run = uvloop.run if uvloop is not None else asyncio.run
+        return run(run_batch())
 
-### 7. Content Restrictions
-- Do NOT include "Portfolio, code samples, and certification transcripts available upon request"
-- Do NOT include any availability statements or contact requests
-- Do NOT include any meta-commentary about the enhancement process
-- Do NOT mention that "this CV was enhanced" or reference the enhancement process
-- Focus only on professional qualifications and achievements
-
-## Current CV:
-{cv_content}
-
-## Job Description:
-{job_description}
-{additional_context}
+    async def _abatch_process_packed(
+        self,
+        states: List[CVState],
+        indices: List[int],
+        results: List[Union[str, Exception, None]],
+        batch_size: int,
+        semaphore: asyncio.Semaphore,
+        limiter: _RateLimiter,
+    ) -> None:
+        """Enhance loaded states, packing CVs that share a job description."""
+        # Only CVs with identical instructions can share a prompt
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index in indices:
+            key = (
+                states[index]["job_description"],
+                json.dumps(
+                    states[index]["additional_input"], sort_keys=True, default=str
+                ),
+            )
+            groups.setdefault(key, []).append(index)
+
+        async def finish(index: int, enhanced_content: Optional[str]) -> None:
+            state = states[index]
+            if enhanced_content is None:
+                # The packed response skipped this CV; enhance it on its own
+                async with semaphore:
+                    await limiter.acquire()
+                    update = await self._enhance_content_node_async(state)
+            else:
+                update = self._enhanced_content_update(enhanced_content)
+            state = {**state, **update}
+            await self._generate_output_node_async(state)
+            results[index] = str(Path(state["output_path"]).absolute())
+
+        async def run(chunk: List[int]) -> None:
+            try:
+                async with semaphore:
+                    await limiter.acquire()
+                    enhanced = await self._aenhance_packed(
+                        [states[index] for index in chunk]
+                    )
+            except Exception as e:
+                # e.g. an oversized request; enhance these CVs one by one instead
+                logger.warning(
+                    f"Batched enhancement request failed, retrying individually: {e}"
+                )
+                enhanced = [None] * len(chunk)
 
-Return ONLY the enhanced CV content starting with the candidate's name as the main header (#), followed by role (##), then the sections using ### headers: Professional Summary:, Core Technical Skills:, Professional Experience:, Education:. Use proper markdown formatting and do not include any commentary about the enhancement process."""
+            outcomes = await asyncio.gather(
+                *(finish(index, content) for index, content in zip(chunk, enhanced)),
+                return_exceptions=True,
+            )
+            for index, outcome in zip(chunk, outcomes):
+                if isinstance(outcome, Exception):
+                    results[index] = outcome
+
+        chunks = [
+            group[start : start + batch_size]
+            for group in groups.values()
+            for start in range(0, len(group), batch_size)
+        ]
+        logger.info(
+            f"Packing {len(indices)} CV(s) into {len(chunks)} enhancement request(s)"
+        )
+        await asyncio.gather(*(run(chunk) for chunk in chunks))
 
-    def process_cv_enhancement(
+    def _initial_state(
         self,
         cv_file_path: str,
         job_description: str,
@@ -740,23 +1663,11 @@ Return ONLY the enhanced CV content starting with the candidate's name as the ma
         output_path: str = "resume.html",
         generate_pdf: bool = True,
         include_logo: bool = True,
-    ) -> str:
-        """
-        Process CV enhancement using LangGraph workflow.
-
-        Args:
-            cv_file_path: Path to CV file or Adobe Express URL
-            job_description: Job description for alignment
-            additional_input: Optional additional context
-            output_path: Output path for enhanced resume
-
-        Returns:
-            Path to generated enhanced resume file
-        """
-        logger.info(f"Starting CV enhancement workflow for: {cv_file_path}")
-
-        # Initialize state
-        initial_state: CVState = {
+        keep_html_debug: bool = False,
+        write_content_sidecar: bool = False,
+    ) -> CVState:
+        """Build the initial workflow state."""
+        return {
             "file_path": cv_file_path,
             "job_description": job_description,
             "additional_input": additional_input,
@@ -765,24 +1676,21 @@ Return ONLY the enhanced CV content starting with the candidate's name as the ma
             "output_path": output_path,
             "generate_pdf": generate_pdf,
             "include_logo": include_logo,
+            "keep_html_debug": keep_html_debug,
+            "write_content_sidecar": write_content_sidecar,
         }
 
-        # Run workflow
-        self.workflow.invoke(initial_state)
-
-        logger.info(f"CV enhancement workflow completed: {output_path}")
-        return str(Path(output_path).absolute())
-
     def _generate_pdf_from_content(
-        self, content: str, output_path: str, include_logo: bool = True
+        self,
+        content: str,
+        output_path: str,
+        include_logo: bool = True,
+        write_content_sidecar: bool = False,
     ) -> bool:
         """Generate PDF directly from content string."""
         try:
-            import base64
-            import os
-
-            import markdown
-            from xhtml2pdf import pisa
+            if pisa is None:
+                raise ImportError("markdown and xhtml2pdf are required")
 
             logger.info(f"Generating PDF from custom content: {output_path}")
 
@@ -797,147 +1705,22 @@ Return ONLY the enhanced CV content starting with the candidate's name as the ma
             # Check if logo should be included
             logo_html = ""
             if include_logo:
-                logo_path = os.path.join(os.getcwd(), "assets", "brainium-logo.svg")
-                if os.path.exists(logo_path):
-                    try:
-                        # Try to convert SVG to base64 for embedding
-                        with open(logo_path, "rb") as logo_file:
-                            logo_data = base64.b64encode(logo_file.read()).decode(
-                                "utf-8"
-                            )
-                            logo_html = f"""
-                            <div style="text-align: center; margin-bottom: 20px;">
-                                <img src="data:image/svg+xml;base64,{logo_data}" alt="Brainium Logo" style="max-width: 150px; height: auto; display: block; margin: 0 auto;">
-                            </div>
-                            """
-                            logger.info("Logo embedded as base64")
-                    except Exception as e:
-                        logger.warning(f"Could not embed SVG logo: {e}")
-                        # Fallback to text logo
-                        logo_html = """
-                        <div style="text-align: center; margin-bottom: 20px; padding-bottom: 15px;">
-                            <div style="font-size: 18px; font-weight: bold; color: #000000;">BRAINIUM</div>
-                        </div>
-                        """
-                        logger.info("Using text logo as fallback")
-
-            # Create full HTML with styling and per-page logo frames
-            full_html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <style>
-                    @page {{
-                        size: a4 portrait;
-                        @frame header_frame {{           /* Static Frame */
-                            -pdf-frame-content: header_content;
-                            left: 50pt; width: 512pt; top: 50pt; height: 60pt;
-                        }}
-                        @frame content_frame {{          /* Content Frame */
-                            left: 50pt; width: 512pt; top: 120pt; height: 602pt;
-                        }}
-                        @frame footer_frame {{           /* Another static Frame */
-                            -pdf-frame-content: footer_content;
-                            left: 50pt; width: 512pt; top: 772pt; height: 20pt;
-                        }}
-                    }}
-                    body {{
-                        font-family: Arial, sans-serif;
-                        line-height: 1.4;
-                        color: #000000;
-                        margin: 0;
-                        padding: 0;
-                        font-size: 15px;
-                    }}
-                    #header_content {{
-                        -pdf-frame-content: header_content;
-                        text-align: center;
-                        padding-bottom: 5px;
-                    }}
-                    #footer_content {{
-                        -pdf-frame-content: footer_content;
-                    }}
-                    h1, h2, h3, h4, h5, h6 {{
-                        color: #000000;
-                        margin-top: 15px;
-                        margin-bottom: 8px;
-                        font-size: 15px;
-                    }}
-                    h1 {{
-                        font-size: 15px;
-                        text-align: right;
-                        margin-top: 0;
-                        margin-bottom: 2px;
-                        padding-bottom: 2px;
-                    }}
-                    h2 {{
-                        font-size: 15px;
-                        margin-top: 2px;
-                        margin-bottom: 8px;
-                        border-bottom: 1px solid #cccccc;
-                        padding-bottom: 2px;
-                        text-align: right;
-                    }}
-                    h3 {{
-                        font-size: 15px;
-                        text-decoration: underline;
-                    }}
-                    ul, ol {{
-                        margin: 5px 0;
-                        padding-left: 20px;
-                        list-style-type: disc;
-                    }}
-                    li {{
-                        margin: 2px 0;
-                        line-height: 1.3;
-                        font-size: 15px;
-                        list-style-type: disc;
-                        list-style-position: outside;
-                    }}
-                    ul li {{
-                        list-style-type: disc;
-                        list-style-position: outside;
-                    }}
-                    ul li ul li {{
-                        list-style-type: circle;
-                        list-style-position: outside;
-                    }}
-                    p {{
-                        margin: 5px 0;
-                        font-size: 15px;
-                    }}
-                    strong {{
-                        color: #333333;
-                    }}
-                    code {{
-                        background-color: #f8f9fa;
-                        padding: 2px 4px;
-                        border-radius: 3px;
-                        font-family: monospace;
-                    }}
-                </style>
-            </head>
-            <body>
-            <!-- Header content for every page -->
-            <div id="header_content">
-                {logo_html.replace('style="max-width: 150px; height: auto;"', 'style="max-width: 80px; height: auto;"')}
-            </div>
-            
-            <!-- Footer content for every page -->
-            <div id="footer_content">
-                <!-- Optional footer content -->
-            </div>
-            
-            <!-- Main content goes in content frame -->
-            {html_content}
-            </body>
-            </html>
-            """
+                logo_html = self._pdf_logo_html(_EDITED_PDF_TEXT_LOGO_HTML)
+
+            # Only the logo and the converted content vary per call
+            full_html = "".join(
+                (
+                    _EDITED_PDF_DOCUMENT_HEAD,
+                    logo_html,
+                    _PDF_DOCUMENT_BODY,
+                    html_content,
+                    _PDF_DOCUMENT_TAIL,
+                )
+            )
 
             # Save HTML file
             html_file = output_file.with_suffix(".html")
-            html_file.write_text(full_html, encoding="utf-8")
+            _write_html(html_file, full_html, content, write_content_sidecar)
 
             # Generate PDF using xhtml2pdf (same method as working original)
             pdf_file = output_file.with_suffix(".pdf")
@@ -8,40 +8,151 @@ This app provides a web interface for enhancing CVs with:
 - PDF output with Brainium logo
 """
 
+import asyncio
+import atexit
+import hashlib
+import io
 import logging
 import os
 import re
+import shutil
 import tempfile
+import threading
 import time
+import zipfile
 from pathlib import Path
+from typing import Optional, Tuple
 
 import streamlit as st
 
 from agents.cv_enhancement_agent import create_cv_enhancement_agent
 
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# First '# ' is name for markdown and '## ' is role
+_NAME_RE = re.compile(r"# (.+)")
+_ROLE_RE = re.compile(r"## (.+)")
+_CONTENT_RE = re.compile(
+    r'<div class="content">\s*(.*?)\s*</div>', re.DOTALL | re.IGNORECASE
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Upper bound for the editable CV text
+_MAX_CONTENT_LEN = 200_000
+
+# Session directories hold uploaded CVs; remove them once idle this long
+_SESSION_DIR_TTL = 6 * 60 * 60
+
+# Widget options and placeholders, built once instead of on every rerun
+_FOCUS_AREAS = (
+    "Frontend",
+    "Backend",
+    "Full Stack",
+    "DevOps",
+    "Cloud",
+    "AI/ML",
+    "Mobile",
+    "Data",
+)
+_COMPANY_TYPES = (
+    "Startup",
+    "Enterprise",
+    "Consulting",
+    "Product Company",
+    "Service Company",
+)
+_ADOBE_URL_PLACEHOLDER = (
+    "Adobe Express: https://new.express.adobe.com/publishedV2/urn:aaid:sc:AP:...\n"
+    "Adobe Acrobat: https://acrobat.adobe.com/id/urn:aaid:sc:AP:..."
+)
+_JD_PLACEHOLDER = """Enter the job description you want to align your CV with...
+
+Example:
+Senior Software Engineer - Full Stack
+
+Requirements:
+• 5+ years of software development
+• Python, JavaScript, React, Node.js
+• Cloud platforms (AWS, Azure)
+• Database experience (PostgreSQL, MongoDB)
+• Microservices architecture
+"""
+_CUSTOM_INSTR_PLACEHOLDER = (
+    "Add specific instructions for enhancement...\n\nExample:\n"
+    "- Focus on backend development\n- Emphasize leadership skills\n"
+    "- Include startup experience"
+)
+
 
-def cleanup_files(file_paths):
-    """Clean up generated files after download."""
-    import threading
-    import time
+@st.cache_resource(show_spinner=False)
+def get_sessions_root() -> str:
+    """Process-wide parent of the session directories, removed at exit."""
+    root = tempfile.mkdtemp(prefix="cv_enhancement_")
+    atexit.register(shutil.rmtree, root, ignore_errors=True)
+    return root
 
-    def delayed_cleanup():
-        # Wait a bit to ensure download completes
-        time.sleep(2)
-        for file_path in file_paths:
+
+def sweep_session_dirs(root: str) -> None:
+    """Remove session directories that have not been written to recently."""
+    cutoff = time.time() - _SESSION_DIR_TTL
+    with os.scandir(root) as entries:
+        for entry in entries:
             try:
-                if file_path.exists():
-                    file_path.unlink()
-                    logger.info(f"Cleaned up file: {file_path}")
-            except Exception as e:
-                logger.warning(f"Could not clean up {file_path}: {e}")
+                if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+            except OSError:
+                continue
+
+
+def get_session_dir() -> str:
+    """Per-session directory for uploads and generated files.
+
+    Starting a session sweeps out directories of sessions idle for longer
+    than _SESSION_DIR_TTL, so uploaded CVs don't outlive their use.
+    """
+    tmpdir = st.session_state.get("tmpdir")
+    if tmpdir is None or not os.path.isdir(tmpdir):
+        root = get_sessions_root()
+        sweep_session_dirs(root)
+        tmpdir = tempfile.mkdtemp(dir=root)
+        st.session_state.tmpdir = tmpdir
+    return tmpdir
+
+
+@st.cache_resource(show_spinner=False)
+def get_logo_svg() -> Optional[str]:
+    """Load the Brainium logo once per process; None if it is missing."""
+    logo_path = Path("assets/brainium-logo.svg")
+    if not logo_path.exists():
+        return None
+    return logo_path.read_text(encoding="utf-8")
+
+
+@st.cache_resource(show_spinner=False)
+def get_agent():
+    """Create the CV enhancement agent once per process and share it."""
+    return create_cv_enhancement_agent()
+
 
-    # Run cleanup in background thread
-    threading.Thread(target=delayed_cleanup, daemon=True).start()
+@st.cache_resource(show_spinner=False)
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """One long-lived event loop on a background thread, shared by all sessions.
+
+    Running every enhancement on the same loop lets the shared agent keep a
+    single async OpenAI client and its warm connection pool.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(
+        target=loop.run_forever, name="cv-enhancement-loop", daemon=True
+    ).start()
+    return loop
 
 
 # Page config
@@ -53,8 +164,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown(
-    """
+_CUSTOM_CSS = """
 <style>
     .main-header {
         text-align: center;
@@ -76,27 +186,272 @@ st.markdown(
         margin: 1rem 0;
     }
 </style>
-""",
-    unsafe_allow_html=True,
-)
+"""
+
+# Sent on every full run: Streamlit removes elements a rerun does not emit again
+st.markdown(_CUSTOM_CSS, unsafe_allow_html=True)
 
 
 def craete_filename_from_name_and_role(html_path: Path) -> str:
     """Create a filename based on the user's name and target role."""
-    with open(html_path, "r", encoding="utf-8") as f:
-        html_content = f.read()
-        # First '# ' is name for markdown and '## ' is role
-        name_match = re.search(r"# (.+)", html_content)
-        role_match = re.search(r"## (.+)", html_content)
-
-        if name_match and role_match:
-            name = name_match.group(1).strip().replace(" ", "_")
-            role = role_match.group(1).strip().replace(" ", "_")
-            filename = f"{name}_{role}.pdf"
+    html_content = html_path.read_text(encoding="utf-8")
+    name_match = _NAME_RE.search(html_content)
+    role_match = _ROLE_RE.search(html_content)
+
+    if name_match and role_match:
+        name = name_match.group(1).strip().replace(" ", "_")
+        role = role_match.group(1).strip().replace(" ", "_")
+        filename = f"{name}_{role}.pdf"
+    else:
+        filename = "enhanced_resume.pdf"
+
+    return filename
+
+
+@st.cache_data(show_spinner=False)
+def regenerate_pdf(
+    content_hash: str, _content: str, include_logo: bool, session_dir: str
+) -> str:
+    """Render edited content once per distinct text and logo choice.
+
+    The content itself is left out of the cache key; its hash stands in for it.
+    """
+    output_path = os.path.join(session_dir, f"edited_resume_{content_hash}")
+    if not get_agent()._generate_pdf_from_content(
+        content=_content,
+        output_path=output_path,
+        include_logo=include_logo,
+        write_content_sidecar=True,
+    ):
+        # Raising keeps the failure out of the cache so a retry runs again
+        raise RuntimeError("Failed to regenerate PDF")
+    return output_path
+
+
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def read_bytes(path: str, mtime: float) -> bytes:
+    """Read a generated file once per version for the download buttons."""
+    return Path(path).read_bytes()
+
+
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def build_bundle(paths: Tuple[str, ...], mtimes: Tuple[float, ...]) -> bytes:
+    """Zip the generated files once per version for a single download."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as bundle:
+        for path in paths:
+            bundle.write(path, arcname=os.path.basename(path))
+    return buffer.getvalue()
+
+
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def load_html_once(html_path: str, mtime: float) -> Tuple[str, str]:
+    """Read a generated HTML file once, returning it with its editable text.
+
+    mtime is only part of the cache key, so a rewritten file is read again.
+    """
+    html_content = Path(html_path).read_text(encoding="utf-8")
+
+    # The agent writes the content next to the HTML; parse only if it is missing
+    content_path = Path(html_path).with_suffix(".content.txt")
+    if content_path.exists():
+        return html_content, content_path.read_text(encoding="utf-8")
+    return html_content, extract_enhanced_text(html_content)
+
+
+def extract_enhanced_text(html_content: str) -> str:
+    """Extract the editable CV text from generated HTML."""
+    if lxml_html is not None:
+        # Only the content div is needed, so query it directly
+        content_divs = lxml_html.fromstring(html_content).xpath(
+            '//div[@class="content"]'
+        )
+
+        if content_divs:
+            # Convert HTML back to markdown-like text for editing
+            return "\n\n".join(
+                text.strip() for text in content_divs[0].itertext() if text.strip()
+            )
+    else:
+        # If lxml is not available, use regex fallback
+        content_match = _CONTENT_RE.search(html_content)
+        if content_match:
+            # Basic HTML tag removal
+            return _TAG_RE.sub("", content_match.group(1).strip())
+
+    # Fallback - nothing usable in the HTML structure
+    return "Could not extract content for editing. Please regenerate."
+
+
+@st.fragment
+def render_results(include_logo: bool):
+    """Review, edit and download section; reruns alone on its own widgets."""
+    if not (st.session_state.processed and st.session_state.result_path):
+        return
+
+    st.markdown("---")
+    st.subheader("� Review & Edit Results")
+
+    result_path = Path(st.session_state.result_path)
+    html_file = result_path.with_suffix(".html")
+    pdf_file = result_path.with_suffix(".pdf")
+
+    # The HTML is read and parsed once per version, then shared below
+    html_data = enhanced_text = None
+    if html_file.exists():
+        html_data, enhanced_text = load_html_once(
+            str(html_file), html_file.stat().st_mtime
+        )
+
+    # Load the enhanced content for editing - ONLY ONCE when first processing
+    if enhanced_text is not None and not st.session_state.edited_content:
+        # Set the content ONLY if it's empty
+        st.session_state.edited_content = enhanced_text
+
+    # ALWAYS show tabs for Edit and Preview (moved outside the if condition)
+    edit_tab, preview_tab = st.tabs(["✏️ Edit Content", "👀 Preview"])
+
+    with edit_tab:
+        st.markdown("**Edit your enhanced CV content below:**")
+
+        # Keep the editor within its character limit
+        if len(st.session_state.edited_content) > _MAX_CONTENT_LEN:
+            st.warning(
+                f"⚠️ Content was truncated to {_MAX_CONTENT_LEN:,} characters."
+            )
+            st.session_state.edited_content = st.session_state.edited_content[
+                :_MAX_CONTENT_LEN
+            ]
+
+        # Editable text area - ALWAYS use session state as source of truth
+        edited_content = st.text_area(
+            "Enhanced CV Content",
+            value=st.session_state.edited_content,
+            height=500,
+            max_chars=_MAX_CONTENT_LEN,
+            key="cv_editor",
+            help="You can edit the enhanced CV content here. The formatting will be preserved when regenerating the PDF.",
+        )
+
+        # Update session state only when the content actually changed
+        if edited_content != st.session_state.edited_content:
+            st.session_state.edited_content = edited_content
+
+        # Regenerate button
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            if st.button(
+                "🔄 Regenerate PDF with Changes",
+                type="primary",
+                use_container_width=True,
+            ):
+                with st.spinner("🔄 Regenerating PDF with your changes..."):
+                    try:
+                        # Generate new files with edited content - use CURRENT content from text area
+                        content_hash = hashlib.blake2b(
+                            edited_content.encode("utf-8"), digest_size=16
+                        ).hexdigest()
+                        new_output_path = regenerate_pdf(
+                            content_hash,
+                            edited_content,
+                            include_logo,
+                            get_session_dir(),
+                        )
+
+                        # Update session state with new files
+                        st.session_state.result_path = new_output_path
+                        st.success(
+                            "✅ PDF regenerated successfully with your changes!"
+                        )
+
+                        # Point the downloads below at the new files
+                        pdf_file = Path(new_output_path).with_suffix(".pdf")
+                        html_file = pdf_file.with_suffix(".html")
+                        html_data, _ = load_html_once(
+                            str(html_file), html_file.stat().st_mtime
+                        )
+
+                    except Exception as e:
+                        st.error(f"❌ Regeneration failed: {str(e)}")
+                        logger.error(f"Regeneration error: {e}")
+
+    with preview_tab:
+        st.markdown("**Preview of your edited content:**")
+
+        # Display the edited content as markdown
+        if st.session_state.edited_content:
+            st.markdown(st.session_state.edited_content)
         else:
-            filename = "enhanced_resume.pdf"
+            st.info(
+                "No content to preview. Please edit the content in the Edit tab."
+            )
+
+    # Download section
+    st.markdown("---")
+    st.subheader("📥 Download Files")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if pdf_file.exists():
+            pdf_data = read_bytes(str(pdf_file), pdf_file.stat().st_mtime)
+            st.download_button(
+                "📄 Download PDF",
+                data=pdf_data,
+                file_name=st.session_state.filename,
+                mime="application/pdf",
+                use_container_width=True,
+            )
+
+    with col2:
+        if html_data is not None:
+            st.download_button(
+                "🌐 Download HTML",
+                data=html_data,
+                file_name=f"enhanced_resume_{int(time.time())}.html",
+                mime="text/html",
+                use_container_width=True,
+            )
+
+    bundle_files = [path for path in (pdf_file, html_file) if path.exists()]
+    if len(bundle_files) > 1:
+        st.download_button(
+            "📦 Download All",
+            data=build_bundle(
+                tuple(str(path) for path in bundle_files),
+                tuple(path.stat().st_mtime for path in bundle_files),
+            ),
+            file_name=f"enhanced_resume_{int(time.time())}.zip",
+            mime="application/zip",
+            use_container_width=True,
+        )
+
+    # Additional feature: Save as different format
+    st.markdown("---")
+    with st.expander("� Additional Download Options"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # Download as plain text
+            if st.session_state.edited_content:
+                st.download_button(
+                    "📝 Download as Text (.txt)",
+                    data=st.session_state.edited_content,
+                    file_name=f"enhanced_resume_{int(time.time())}.txt",
+                    mime="text/plain",
+                    use_container_width=True,
+                )
 
-        return filename
+        with col2:
+            # Download as markdown
+            if st.session_state.edited_content:
+                st.download_button(
+                    "📋 Download as Markdown (.md)",
+                    data=st.session_state.edited_content,
+                    file_name=f"enhanced_resume_{int(time.time())}.md",
+                    mime="text/markdown",
+                    use_container_width=True,
+                )
 
 
 def main():
@@ -106,9 +461,9 @@ def main():
     st.markdown('<div class="main-header">', unsafe_allow_html=True)
 
     # Display logo if exists
-    logo_path = Path("assets/brainium-logo.svg")
-    if logo_path.exists():
-        st.image(str(logo_path), width=200)
+    logo_svg = get_logo_svg()
+    if logo_svg:
+        st.image(logo_svg, width=200)
 
     st.title("🚀 CV Enhancement Agent")
     st.markdown("*Transform your CV with AI-powered optimization*")
@@ -142,16 +497,7 @@ def main():
         with st.expander("🔧 Advanced Options"):
             focus_areas = st.multiselect(
                 "Focus Areas",
-                [
-                    "Frontend",
-                    "Backend",
-                    "Full Stack",
-                    "DevOps",
-                    "Cloud",
-                    "AI/ML",
-                    "Mobile",
-                    "Data",
-                ],
+                _FOCUS_AREAS,
                 help="Specific areas to emphasize in enhancement",
             )
 
@@ -166,13 +512,7 @@ def main():
 
             target_company = st.selectbox(
                 "Target Company Type",
-                [
-                    "Startup",
-                    "Enterprise",
-                    "Consulting",
-                    "Product Company",
-                    "Service Company",
-                ],
+                _COMPANY_TYPES,
                 help="Tailor content for specific company type",
             )
 
@@ -200,21 +540,43 @@ def main():
             )
             st.markdown("</div>", unsafe_allow_html=True)
 
-            if uploaded_file is not None:
-                # Save uploaded file temporarily
-                with tempfile.NamedTemporaryFile(
-                    delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}"
-                ) as tmp_file:
-                    tmp_file.write(uploaded_file.getvalue())
-                    cv_file_path = tmp_file.name
-
-                st.success(f"✅ Uploaded: {uploaded_file.name}")
+            tmp_path = st.session_state.get("uploaded_tmp_path")
+            if uploaded_file is None:
+                # The upload was removed; drop its temp file as well
+                if tmp_path and os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                st.session_state.uploaded_file_id = None
+                st.session_state.uploaded_tmp_path = None
+            else:
+                # Save each upload once; unrelated reruns reuse the temp file
+                if (
+                    st.session_state.get("uploaded_file_id") != uploaded_file.file_id
+                    or not tmp_path
+                    or not os.path.exists(tmp_path)
+                ):
+                    if tmp_path and os.path.exists(tmp_path):
+                        os.unlink(tmp_path)  # Replaced by a different upload
+
+                    # Save uploaded file temporarily, streaming it in 1 MiB chunks
+                    uploaded_file.seek(0)
+                    with tempfile.NamedTemporaryFile(
+                        delete=False,
+                        suffix=os.path.splitext(uploaded_file.name)[1],
+                        dir=get_session_dir(),
+                    ) as tmp_file:
+                        shutil.copyfileobj(uploaded_file, tmp_file, length=1024 * 1024)
+                    st.session_state.uploaded_file_id = uploaded_file.file_id
+                    st.session_state.uploaded_tmp_path = tmp_path = tmp_file.name
+                    st.session_state.cv_file_name = uploaded_file.name
+                cv_file_path = tmp_path
+
+                st.success(f"✅ Uploaded: {st.session_state.cv_file_name}")
 
         else:  # Adobe URL
             st.markdown('<div class="upload-section">', unsafe_allow_html=True)
             adobe_url = st.text_input(
                 "Adobe URL",
-                placeholder="Adobe Express: https://new.express.adobe.com/publishedV2/urn:aaid:sc:AP:...\nAdobe Acrobat: https://acrobat.adobe.com/id/urn:aaid:sc:AP:...",
+                placeholder=_ADOBE_URL_PLACEHOLDER,
                 help="Paste your Adobe Express or Adobe Acrobat document URL",
             )
             st.markdown("</div>", unsafe_allow_html=True)
@@ -232,6 +594,9 @@ def main():
                 else:
                     st.success("✅ Adobe URL provided")
 
+        # Kept in session state so the processing step reads a stable value
+        st.session_state.cv_file_path = cv_file_path
+
     with col2:
         st.subheader("🎯 Job Description")
 
@@ -239,18 +604,7 @@ def main():
             "Target Job Description",
             height=300,
             key="job_description_input",
-            placeholder="""Enter the job description you want to align your CV with...
-
-Example:
-Senior Software Engineer - Full Stack
-
-Requirements:
-• 5+ years of software development
-• Python, JavaScript, React, Node.js
-• Cloud platforms (AWS, Azure)
-• Database experience (PostgreSQL, MongoDB)
-• Microservices architecture
-""",
+            placeholder=_JD_PLACEHOLDER,
             help="The more detailed the job description, the better the alignment",
         )
 
@@ -259,7 +613,7 @@ Requirements:
             additional_text = st.text_area(
                 "Custom Instructions",
                 height=150,
-                placeholder="Add specific instructions for enhancement...\n\nExample:\n- Focus on backend development\n- Emphasize leadership skills\n- Include startup experience",
+                placeholder=_CUSTOM_INSTR_PLACEHOLDER,
                 help="Provide specific guidance for the enhancement process",
             )
 
@@ -277,6 +631,7 @@ Requirements:
     # Processing - validate inputs when button is clicked
     if process_btn:
         # Validate inputs
+        cv_file_path = st.session_state.cv_file_path
         if not cv_file_path:
             st.error("❌ Please provide a CV file or Adobe URL")
         elif not job_description or not job_description.strip():
@@ -303,18 +658,26 @@ Requirements:
 
             with st.spinner("🔄 Enhancing your CV... This may take a few moments."):
                 try:
-                    # Create agent and process
-                    agent = create_cv_enhancement_agent()
-
-                    output_path = "enhanced_resume"
-                    result_path = agent.process_cv_enhancement(
-                        cv_file_path=cv_file_path,
-                        job_description=job_description,
-                        additional_input=additional_input,
-                        output_path=output_path,
-                        generate_pdf=generate_pdf,
-                        include_logo=include_logo,
-                    )
+                    # Get the shared agent and process
+                    agent = get_agent()
+
+                    output_path = os.path.join(get_session_dir(), "enhanced_resume")
+                    # The async workflow streams the LLM response and renders
+                    # the PDF in a shared worker pool; it runs on the app's
+                    # long-lived loop while this script thread waits
+                    result_path = asyncio.run_coroutine_threadsafe(
+                        agent.aprocess_cv_enhancement(
+                            cv_file_path=cv_file_path,
+                            job_description=job_description,
+                            additional_input=additional_input,
+                            output_path=output_path,
+                            generate_pdf=generate_pdf,
+                            include_logo=include_logo,
+                            keep_html_debug=True,
+                            write_content_sidecar=True,
+                        ),
+                        get_event_loop(),
+                    ).result()
 
                     st.session_state.processed = True
                     st.session_state.result_path = result_path
@@ -326,193 +689,12 @@ Requirements:
 
                     st.success("✅ CV Enhancement completed successfully!")
 
-                    # Clean up temporary file
-                    if (
-                        input_method == "Upload File"
-                        and cv_file_path
-                        and os.path.exists(cv_file_path)
-                    ):
-                        os.unlink(cv_file_path)
-
                 except Exception as e:
                     st.error(f"❌ Enhancement failed: {str(e)}")
                     logger.error(f"Enhancement error: {e}")
 
     # Display results
-    if st.session_state.processed and st.session_state.result_path:
-        st.markdown("---")
-        st.subheader("� Review & Edit Results")
-
-        result_path = Path(st.session_state.result_path)
-        html_file = result_path.with_suffix(".html")
-        pdf_file = result_path.with_suffix(".pdf")
-
-        # Load the enhanced content for editing - ONLY ONCE when first processing
-        if html_file.exists() and not st.session_state.edited_content:
-            with open(html_file, "r", encoding="utf-8") as f:
-                html_content = f.read()
-
-            # Extract enhanced content from HTML
-            import re
-
-            try:
-                from bs4 import BeautifulSoup
-
-                soup = BeautifulSoup(html_content, "html.parser")
-                content_div = soup.find("div", class_="content")
-
-                if content_div:
-                    # Convert HTML back to markdown-like text for editing
-                    enhanced_text = content_div.get_text(
-                        separator="\n\n", strip=True)
-                else:
-                    # Fallback - try to extract from HTML structure
-                    enhanced_text = (
-                        "Could not extract content for editing. Please regenerate."
-                    )
-            except ImportError:
-                # If BeautifulSoup is not available, use regex fallback
-                content_match = re.search(
-                    r'<div class="content">\s*(.*?)\s*</div>',
-                    html_content,
-                    re.DOTALL | re.IGNORECASE,
-                )
-                if content_match:
-                    enhanced_text = content_match.group(1).strip()
-                    # Basic HTML tag removal
-                    enhanced_text = re.sub(r"<[^>]+>", "", enhanced_text)
-                else:
-                    enhanced_text = (
-                        "Could not extract content for editing. Please regenerate."
-                    )
-
-            # Set the content ONLY if it's empty
-            st.session_state.edited_content = enhanced_text
-
-        # ALWAYS show tabs for Edit and Preview (moved outside the if condition)
-        edit_tab, preview_tab = st.tabs(["✏️ Edit Content", "👀 Preview"])
-
-        with edit_tab:
-            st.markdown("**Edit your enhanced CV content below:**")
-
-            # Editable text area - ALWAYS use session state as source of truth
-            edited_content = st.text_area(
-                "Enhanced CV Content",
-                value=st.session_state.edited_content,
-                height=500,
-                key="cv_editor",
-                help="You can edit the enhanced CV content here. The formatting will be preserved when regenerating the PDF.",
-            )
-
-            # ALWAYS update session state when content changes
-            st.session_state.edited_content = edited_content
-
-            # Regenerate button
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col2:
-                if st.button(
-                    "🔄 Regenerate PDF with Changes",
-                    type="primary",
-                    use_container_width=True,
-                ):
-                    with st.spinner("🔄 Regenerating PDF with your changes..."):
-                        try:
-                            # Create agent
-                            agent = create_cv_enhancement_agent()
-
-                            # Generate new files with edited content - use CURRENT content from text area
-                            new_output_path = f"edited_resume_{int(time.time())}"
-
-                            # Call the agent's method to generate PDF with custom content
-                            success = agent._generate_pdf_from_content(
-                                content=edited_content,  # Use the content from the text area directly
-                                output_path=new_output_path,
-                                include_logo=include_logo,
-                            )
-
-                            if success:
-                                # Update session state with new files
-                                st.session_state.result_path = new_output_path
-                                st.success(
-                                    "✅ PDF regenerated successfully with your changes!"
-                                )
-                                st.rerun()
-                            else:
-                                st.error("❌ Failed to regenerate PDF")
-
-                        except Exception as e:
-                            st.error(f"❌ Regeneration failed: {str(e)}")
-                            logger.error(f"Regeneration error: {e}")
-
-        with preview_tab:
-            st.markdown("**Preview of your edited content:**")
-
-            # Display the edited content as markdown
-            if st.session_state.edited_content:
-                st.markdown(st.session_state.edited_content)
-            else:
-                st.info(
-                    "No content to preview. Please edit the content in the Edit tab."
-                )
-
-        # Download section
-        st.markdown("---")
-        st.subheader("📥 Download Files")
-
-        col1, col2 = st.columns(2)
-
-        with col1:
-            if pdf_file.exists():
-                with open(pdf_file, "rb") as f:
-                    pdf_data = f.read()
-                    st.download_button(
-                        "📄 Download PDF",
-                        data=pdf_data,
-                        file_name=st.session_state.filename,
-                        mime="application/pdf",
-                        use_container_width=True,
-                        on_click=lambda: cleanup_files([pdf_file, html_file]),
-                    )
-
-        with col2:
-            if html_file.exists():
-                with open(html_file, "r", encoding="utf-8") as f:
-                    html_data = f.read()
-                    st.download_button(
-                        "🌐 Download HTML",
-                        data=html_data,
-                        file_name=f"enhanced_resume_{int(time.time())}.html",
-                        mime="text/html",
-                        use_container_width=True,
-                        on_click=lambda: cleanup_files([pdf_file, html_file]),
-                    )
-
-        # Additional feature: Save as different format
-        st.markdown("---")
-        with st.expander("� Additional Download Options"):
-            col1, col2 = st.columns(2)
-
-            with col1:
-                # Download as plain text
-                if st.session_state.edited_content:
-                    st.download_button(
-                        "📝 Download as Text (.txt)",
-                        data=st.session_state.edited_content,
-                        file_name=f"enhanced_resume_{int(time.time())}.txt",
-                        mime="text/plain",
-                        use_container_width=True,
-                    )
-
-            with col2:
-                # Download as markdown
-                if st.session_state.edited_content:
-                    st.download_button(
-                        "📋 Download as Markdown (.md)",
-                        data=st.session_state.edited_content,
-                        file_name=f"enhanced_resume_{int(time.time())}.md",
-                        mime="text/markdown",
-                        use_container_width=True,
-                    )
+    render_results(include_logo)
 
     # Footer
     st.markdown("---")
@@ -5,9 +5,22 @@ class AppSettings(BaseSettings):
     LLM_BASE_URL: str = "https://api.githubcopilot.com"
     LLM_API_KEY: str = ""
     LLM_MODEL: str = "gpt-4.1"
+    # Sampling limits for enhancement requests (max tokens is per CV)
+    LLM_MAX_TOKENS: int = 2048
+    LLM_TEMPERATURE: float = 0.3
+    LLM_TOP_P: float = 0.9
+    # Model's hard output limit; packed batch requests are clamped to it
+    LLM_MAX_OUTPUT_TOKENS: int = 16384
 
     COPILOT_ACCESS_TOKEN: str = ""
 
+    # Worker processes for loading batch documents (0 = CPU count - 1)
+    DOC_LOAD_WORKERS: int = 0
+    # Worker processes for rendering PDFs in async runs (0 = CPU count)
+    PDF_WORKERS: int = 0
+    # Directory for compiled Jinja templates ("" = system temp directory)
+    JINJA_CACHE_DIR: str = ""
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
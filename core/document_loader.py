@@ -1,13 +1,14 @@
+import importlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from enum import Enum
+from functools import lru_cache, partial
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
 
-from langchain_community.document_loaders import (
-    PyPDFLoader,
-    TextLoader,
-    UnstructuredWordDocumentLoader,
-)
+from langchain_community.document_loaders.base import BaseLoader
 
-from core.loaders.adobe_acrobat_loader import AdobeAcrobatLoader
-from core.loaders.adobe_express_loader import AdobeExpressLoader
+from lib.utils import process_pool_context
 
 
 class FileType(Enum):
@@ -18,45 +19,149 @@ class FileType(Enum):
     ADOBE_ACROBAT = "adobe_acrobat"
 
 
-LOADERS = (
-    (FileType.PDF, PyPDFLoader),
-    (FileType.DOCX, UnstructuredWordDocumentLoader),
-    (FileType.TEXT, TextLoader),
-    (FileType.ADOBE_EXPRESS, AdobeExpressLoader),
-    (FileType.ADOBE_ACROBAT, AdobeAcrobatLoader),
-)
+# Loaders are named as "module:Class" and imported on first use, so loading
+# a PDF never pays for unstructured (DOCX) or the Adobe HTTP stack
+LOADERS: Dict[FileType, str] = {
+    FileType.PDF: "langchain_community.document_loaders:PyPDFLoader",
+    FileType.DOCX: "langchain_community.document_loaders:UnstructuredWordDocumentLoader",
+    FileType.TEXT: "langchain_community.document_loaders:TextLoader",
+    FileType.ADOBE_EXPRESS: "core.loaders.adobe_express_loader:AdobeExpressLoader",
+    FileType.ADOBE_ACROBAT: "core.loaders.adobe_acrobat_loader:AdobeAcrobatLoader",
+}
+
+
+@lru_cache(maxsize=None)
+def _get_loader_cls(file_type: FileType) -> Type[BaseLoader]:
+    """Import and return the loader class registered for a file type."""
+    try:
+        module_name, class_name = LOADERS[file_type].split(":")
+    except KeyError:
+        raise ValueError(f"Unsupported file type: {file_type}")
+    return getattr(importlib.import_module(module_name), class_name)
 
 
 def load_document(url: str, file_type: FileType) -> list:
     """Load a single document from the given file path or url."""
+    return _get_loader_cls(file_type)(url).load()
+
+
+# Adobe loaders mostly wait on the network; local files are parsed on the CPU
+_REMOTE_TYPES = frozenset({FileType.ADOBE_EXPRESS, FileType.ADOBE_ACROBAT})
+
+
+def load_document_batch(
+    items: Sequence[Tuple[str, FileType]],
+    max_workers: Optional[int] = None,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """
+    Load several documents concurrently.
+
+    Adobe URLs are fetched in a thread pool while local files are parsed in a
+    process pool, so one slow download never holds up local parsing.
+
+    Args:
+        items: (url or path, file type) pairs
+        max_workers: Upper bound on workers per pool (default: CPU count - 1)
+        return_exceptions: Return a failed item's exception in its slot
+            instead of raising it
+
+    Returns:
+        The loaded documents per item, in the order of ``items``
+    """
+    results: List[Any] = [None] * len(items)
+    if not items:
+        return results
+
+    remote = [i for i, (_, kind) in enumerate(items) if kind in _REMOTE_TYPES]
+    local = [i for i, (_, kind) in enumerate(items) if kind not in _REMOTE_TYPES]
+    prefetch_local_files(items[i][0] for i in local)
 
-    for ft, loader_cls in LOADERS:
-        if ft == file_type:
-            if file_type in [FileType.ADOBE_EXPRESS, FileType.ADOBE_ACROBAT]:
-                loader = loader_cls(url)
-            else:
-                loader = loader_cls(url)
-            return loader.load()
-    raise ValueError(f"Unsupported file type: {file_type}")
+    workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+    pools = []
+    try:
+        futures = {}
+        for indices, executor_cls in (
+            (remote, ThreadPoolExecutor),
+            # Not forked: callers run this next to the app's threads
+            (local, partial(ProcessPoolExecutor, mp_context=process_pool_context())),
+        ):
+            if not indices:
+                continue
+            pool = executor_cls(max_workers=min(workers, len(indices)))
+            pools.append(pool)
+            for index in indices:
+                futures[pool.submit(load_document, *items[index])] = index
+
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[index] = e
+    finally:
+        for pool in pools:
+            pool.shutdown(cancel_futures=True)
+    return results
+
+
+def prefetch_local_files(paths: Iterable[str]) -> None:
+    """
+    Ask the kernel to start reading local files into the page cache.
+
+    Reads for every file are queued at once, so later parsing hits warm pages.
+    Paths that cannot be opened (URLs, missing files) are skipped, and this is
+    a no-op on platforms without posix_fadvise.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+# Matched against the lower-cased input; group 1 means Adobe Express
+_ADOBE_RE = re.compile(
+    r"(new\.express\.adobe\.com)|acrobat\.adobe\.com|urn:aaid:sc:ap:"
+)
+
+_SUFFIX_MAP = {
+    ".pdf": FileType.PDF,
+    ".docx": FileType.DOCX,
+    ".doc": FileType.DOCX,
+    ".txt": FileType.TEXT,
+}
 
 
 def detect_file_type(url_or_path: str) -> FileType:
     """Detect file type from URL or file path."""
-    url_lower = url_or_path.lower()
+    file_type = _detect_file_type_cached(url_or_path.lower())
+    if file_type is None:
+        raise ValueError(f"Cannot detect file type from: {url_or_path}")
+    return file_type
+
+
+@lru_cache(maxsize=4096)
+def _detect_file_type_cached(url_lower: str) -> Optional[FileType]:
+    """Memoized detection on the lower-cased URL or path."""
 
     # Check for Adobe URLs
-    if "new.express.adobe.com" in url_lower:
-        return FileType.ADOBE_EXPRESS
-    elif "acrobat.adobe.com" in url_lower or "urn:aaid:sc:AP:" in url_lower:
+    adobe_match = _ADOBE_RE.search(url_lower)
+    if adobe_match:
+        if adobe_match.group(1):
+            return FileType.ADOBE_EXPRESS
         return FileType.ADOBE_ACROBAT
 
     # Check file extensions
-    if url_lower.endswith(".pdf"):
-        return FileType.PDF
-    elif url_lower.endswith(".docx") or url_lower.endswith(".doc"):
-        return FileType.DOCX
-    elif url_lower.endswith(".txt"):
-        return FileType.TEXT
-
-    # Default fallback
-    raise ValueError(f"Cannot detect file type from: {url_or_path}")
+    return _SUFFIX_MAP.get(os.path.splitext(url_lower)[1])
@@ -1,17 +1,29 @@
+import io
 import logging
-import os
-import tempfile
+import re
 
 import bs4
+import msgspec
 import requests
-from langchain_community.document_loaders import PyPDFLoader
 from langchain_community.document_loaders.base import BaseLoader
 from langchain_core.documents import Document
+from pypdf import PdfReader
 
+from core.loaders._http import SESSION
 from schema.adobe import Acrobat
 
 logger = logging.getLogger(__name__)
 
+# The share page embeds its state as <script id="dc_data">; matching it
+# directly avoids building a DOM for the whole (multi-MB) page
+_DC_DATA_RE = re.compile(
+    r"<script\b[^>]*\sid=[\"']dc_data[\"'][^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Typed decoder for the #dc_data payload, built once and reused per load
+_ACROBAT_DECODER = msgspec.json.Decoder(Acrobat)
+
 
 class AdobeAcrobatLoader(BaseLoader):
     """
@@ -21,7 +33,7 @@ class AdobeAcrobatLoader(BaseLoader):
     1. Fetching the share page HTML
     2. Extracting the PDF download URL from the embedded JSON data
     3. Downloading the PDF file
-    4. Loading content using PyPDFLoader
+    4. Loading content in memory using pypdf
     """
 
     def __init__(self, url: str, timeout: int = 30):
@@ -44,7 +56,7 @@ class AdobeAcrobatLoader(BaseLoader):
 
         self.url = url
         self.timeout = timeout
-        logger.info(f"Initialized AdobeAcrobatLoader with URL: {url}")
+        logger.debug(f"Initialized AdobeAcrobatLoader with URL: {url}")
 
     def _fetch_page_html(self) -> str:
         """
@@ -58,19 +70,19 @@ class AdobeAcrobatLoader(BaseLoader):
             ValueError: If the response is empty or invalid
         """
         try:
-            logger.info(f"Fetching HTML from: {self.url}")
+            logger.debug(f"Fetching HTML from: {self.url}")
 
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             }
 
-            response = requests.get(self.url, headers=headers, timeout=self.timeout)
+            response = SESSION.get(self.url, headers=headers, timeout=self.timeout)
             response.raise_for_status()
 
             if not response.text.strip():
                 raise ValueError("Received empty response from Adobe Acrobat")
 
-            logger.info(
+            logger.debug(
                 f"Successfully fetched HTML content ({len(response.text)} characters)"
             )
             return response.text
@@ -96,27 +108,32 @@ class AdobeAcrobatLoader(BaseLoader):
             ValueError: If the required data cannot be found or parsed
         """
         try:
-            logger.info("Parsing HTML to extract PDF download URL")
-
-            document = bs4.BeautifulSoup(html, "html.parser")
-
-            # Look for the data element
-            element = document.find(id="dc_data")
-            if not element:
-                logger.error("Could not find #dc_data element in HTML")
-                raise ValueError(
-                    "Could not find the required data element (#dc_data) in the HTML"
-                )
+            logger.debug("Parsing HTML to extract PDF download URL")
+
+            match = _DC_DATA_RE.search(html)
+            if match:
+                json_text = match.group(1).strip()
+            else:
+                # Fall back to a full parse if the markup is not the usual script
+                document = bs4.BeautifulSoup(html, "html.parser")
+
+                # Look for the data element
+                element = document.find(id="dc_data")
+                if not element:
+                    logger.error("Could not find #dc_data element in HTML")
+                    raise ValueError(
+                        "Could not find the required data element (#dc_data) in the HTML"
+                    )
 
-            json_text = element.get_text(strip=True)
+                json_text = element.get_text(strip=True)
             if not json_text:
                 raise ValueError("Found #dc_data element but it contains no data")
 
-            logger.info(f"Found JSON data ({len(json_text)} characters)")
+            logger.debug(f"Found JSON data ({len(json_text)} characters)")
 
             # Parse the JSON data using the Acrobat schema
             try:
-                data = Acrobat.model_validate_json(json_text)
+                data = _ACROBAT_DECODER.decode(json_text)
             except Exception as e:
                 logger.error(f"Failed to parse JSON data: {e}")
                 raise ValueError(f"Failed to parse Adobe Acrobat data: {e}")
@@ -127,7 +144,7 @@ class AdobeAcrobatLoader(BaseLoader):
                 if not download_url:
                     raise ValueError("Download URL is empty in the parsed data")
 
-                logger.info(
+                logger.debug(
                     f"Successfully extracted PDF download URL: {download_url[:100]}..."
                 )
                 return download_url
@@ -140,7 +157,7 @@ class AdobeAcrobatLoader(BaseLoader):
             logger.error(f"Failed to extract PDF URL: {e}")
             raise
 
-    def _download_pdf(self, pdf_url: str) -> bytes:
+    def _download_pdf(self, pdf_url: str) -> io.BytesIO:
         """
         Download the PDF content from the extracted URL.
 
@@ -148,33 +165,40 @@ class AdobeAcrobatLoader(BaseLoader):
             pdf_url: The PDF download URL
 
         Returns:
-            bytes: The PDF file content
+            io.BytesIO: In-memory buffer holding the PDF file content
 
         Raises:
             requests.RequestException: If the download fails
             ValueError: If the downloaded content is invalid
         """
         try:
-            logger.info(f"Downloading PDF from: {pdf_url[:100]}...")
+            logger.debug(f"Downloading PDF from: {pdf_url[:100]}...")
 
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
                 "Accept": "application/pdf,application/octet-stream,*/*",
             }
 
-            response = requests.get(pdf_url, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
-
-            content = response.content
-            if not content:
+            # Stream straight into one buffer instead of holding a second copy
+            buffer = io.BytesIO()
+            with SESSION.get(
+                pdf_url, headers=headers, timeout=self.timeout, stream=True
+            ) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    buffer.write(chunk)
+
+            size = buffer.tell()
+            if not size:
                 raise ValueError("Downloaded PDF file is empty")
 
             # Basic PDF validation
-            if not content.startswith(b"%PDF"):
+            if buffer.getbuffer()[:4] != b"%PDF":
                 logger.warning("Downloaded content may not be a valid PDF file")
 
-            logger.info(f"Successfully downloaded PDF ({len(content)} bytes)")
-            return content
+            logger.debug(f"Successfully downloaded PDF ({size} bytes)")
+            buffer.seek(0)
+            return buffer
 
         except requests.RequestException as e:
             logger.error(f"Failed to download PDF from {pdf_url}: {e}")
@@ -183,64 +207,48 @@ class AdobeAcrobatLoader(BaseLoader):
             logger.error(f"Unexpected error downloading PDF: {e}")
             raise ValueError(f"Failed to download PDF: {e}")
 
-    def _load_pdf_content(self, pdf_content: bytes) -> list[Document]:
+    def _load_pdf_content(self, pdf_buffer: io.BytesIO) -> list[Document]:
         """
-        Load the PDF content using PyPDFLoader.
+        Load the PDF content with pypdf, straight from memory.
 
         Args:
-            pdf_content: The PDF file content as bytes
+            pdf_buffer: In-memory buffer holding the PDF file content
 
         Returns:
-            list[Document]: List of documents extracted from the PDF
+            list[Document]: One document per PDF page
 
         Raises:
             Exception: If PDF loading fails
         """
-        temp_file = None
         try:
-            logger.info("Creating temporary PDF file for processing")
-
-            # Create a temporary file with .pdf extension
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-                temp_file.write(pdf_content)
-                temp_file_path = temp_file.name
+            reader = PdfReader(pdf_buffer)
+            file_size = len(pdf_buffer.getbuffer())
 
-            logger.info(f"Temporary PDF file created: {temp_file_path}")
-
-            # Load the PDF using PyPDFLoader
-            loader = PyPDFLoader(temp_file_path)
-            documents = loader.load()
-
-            if not documents:
-                raise ValueError("No content could be extracted from the PDF")
-
-            # Enhance metadata
-            for doc in documents:
-                doc.metadata.update(
-                    {
+            documents = [
+                Document(
+                    page_content=page.extract_text(),
+                    metadata={
                         "source": self.url,
+                        "page": page_number,
                         "loader": "AdobeAcrobatLoader",
                         "original_source": "Adobe Acrobat Share",
-                        "file_size": len(pdf_content),
-                    }
+                        "file_size": file_size,
+                    },
                 )
+                for page_number, page in enumerate(reader.pages)
+            ]
 
-            logger.info(f"Successfully loaded {len(documents)} document pages from PDF")
+            if not documents:
+                raise ValueError("No content could be extracted from the PDF")
+
+            logger.debug(
+                f"Successfully loaded {len(documents)} document pages from PDF"
+            )
             return documents
 
         except Exception as e:
             logger.error(f"Failed to load PDF content: {e}")
             raise
-        finally:
-            # Clean up temporary file
-            if temp_file and os.path.exists(temp_file_path):
-                try:
-                    os.unlink(temp_file_path)
-                    logger.info("Temporary PDF file cleaned up")
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to clean up temporary file {temp_file_path}: {e}"
-                    )
 
     def load(self) -> list[Document]:
         """
@@ -253,7 +261,7 @@ class AdobeAcrobatLoader(BaseLoader):
             Exception: If any step in the loading process fails
         """
         try:
-            logger.info("Starting Adobe Acrobat document loading process")
+            logger.debug("Starting Adobe Acrobat document loading process")
 
             # Step 1: Fetch the HTML page
             html_content = self._fetch_page_html()
@@ -262,10 +270,10 @@ class AdobeAcrobatLoader(BaseLoader):
             pdf_url = self._extract_pdf_url(html_content)
 
             # Step 3: Download the PDF
-            pdf_content = self._download_pdf(pdf_url)
+            pdf_buffer = self._download_pdf(pdf_url)
 
             # Step 4: Load PDF content
-            documents = self._load_pdf_content(pdf_content)
+            documents = self._load_pdf_content(pdf_buffer)
 
             logger.info("Successfully completed Adobe Acrobat loading process")
             return documents
@@ -1,12 +1,20 @@
-import json
 import logging
-from typing import Any, AsyncIterator, Dict, Iterator
+import re
+import threading
+from collections import deque
+from functools import cached_property
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
 
 import aiohttp
 import requests
+from cachetools import TTLCache, cached
 from langchain_community.document_loaders.base import BaseLoader
 from langchain_core.documents import Document
 
+from core.loaders._http import SESSION, json_loads
+
+logger = logging.getLogger(__name__)
+
 # Constants
 ADOBE_TOKEN_URL = "https://adobeid-na1.services.adobe.com/ims/check/v6/token?jslVersion=v2-v0.45.0-5-gb993c08"
 ADOBE_DOC_URL_TEMPLATE = "https://new.express.adobe.com/service/das/documents/urn:aaid:sc:AP:{urn}?allowArtifact=true"
@@ -14,6 +22,33 @@ CLIENT_ID = "projectx_webapp"
 SCOPE = "ab.manage,AdobeID,openid,read_organizations,creative_cloud,creative_sdk,tk_platform,tk_platform_sync,af_byof,stk.a.license_skip.r,stk.a.limited_license.cru,additional_info.optionalAgreements,uds_read,uds_write,af_ltd_projectx,unified_dev_portal,additional_info.ownerOrg,additional_info.roles,additional_info.roles,DCAPI,additional_info.auth_source,additional_info.authenticatingAccount,pps.write,pps.delete,pps.image_write,tk_platform_grant_free_subscription,pps.read,firefly_api,additional_info.projectedProductContext,adobeio.appregistry.read,adobeio.appregistry.write,account_cluster.read,indesign_services,eduprofile.write,eduprofile.read"
 URN_PREFIX = "urn:aaid:sc:AP:"
 REQUEST_TIMEOUT = 10
+TOKEN_CACHE_TTL = 3600
+DOCUMENT_CACHE_TTL = 300
+
+_URN_RE = re.compile(re.escape(URN_PREFIX) + r"([^?/]+)")
+
+# Guest tokens and fetched docModels are shared by every loader instance, so
+# Streamlit reruns and repeated load()/aload() calls skip the round-trips.
+_TOKEN_CACHE: TTLCache = TTLCache(maxsize=1, ttl=TOKEN_CACHE_TTL)
+_TOKEN_LOCK = threading.Lock()
+_DOCUMENT_CACHE: TTLCache = TTLCache(maxsize=64, ttl=DOCUMENT_CACHE_TTL)
+_DOCUMENT_LOCK = threading.Lock()
+
+
+def _get_json(url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """GET ``url`` and return the decoded JSON body, raising on HTTP errors."""
+    response = SESSION.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return json_loads(response.content)
+
+
+async def _aget_json(
+    session: aiohttp.ClientSession, url: str, headers: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """Asynchronously GET ``url`` and return the decoded JSON body, raising on HTTP errors."""
+    async with session.get(url, headers=headers) as response:
+        response.raise_for_status()
+        return json_loads(await response.read())
 
 
 class AdobeExpressLoader(BaseLoader):
@@ -35,79 +70,99 @@ class AdobeExpressLoader(BaseLoader):
             )
         self.url = url
 
-    def _extract_urn(self) -> str:
-        """Extract the URN identifier from the Adobe Express URL."""
-        if URN_PREFIX in self.url:
-            return self.url.split(URN_PREFIX)[1].split("?")[0]
-        else:
+    @cached_property
+    def urn(self) -> str:
+        """The URN identifier from the Adobe Express URL."""
+        match = _URN_RE.search(self.url)
+        if not match:
             raise ValueError("Invalid Adobe Express URL format.")
+        return match.group(1)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop the cached OAuth token and fetched documents."""
+        with _TOKEN_LOCK:
+            _TOKEN_CACHE.clear()
+        with _DOCUMENT_LOCK:
+            _DOCUMENT_CACHE.clear()
 
     def extract_text_models(self, doc_model: Dict[str, Any]) -> list[str]:
         """Extract all TextModel text using BFS to handle deep nesting efficiently."""
         results: list[str] = []
-        queue = [doc_model]
+        queue: deque = deque([doc_model])
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             if isinstance(current, dict):
-                for k, v in current.items():
-                    if isinstance(v, dict):
-                        if "TextModel" in v and isinstance(v["TextModel"], dict):
-                            text = v["TextModel"].get("text")
-                            if text:
-                                results.append(text)
-                        queue.append(v)
+                text_model = current.get("TextModel")
+                if isinstance(text_model, dict) and text_model.get("text"):
+                    results.append(text_model["text"])
+                # The TextModel subtree has been read; don't walk it again
+                queue.extend(
+                    v
+                    for k, v in current.items()
+                    if k != "TextModel" and isinstance(v, (dict, list))
+                )
+            elif isinstance(current, list):
+                queue.extend(v for v in current if isinstance(v, (dict, list)))
         return results
 
+    @cached(
+        _DOCUMENT_CACHE, key=lambda self, urn, token: (urn, token), lock=_DOCUMENT_LOCK
+    )
     def _fetch_document(self, urn: str, token: str) -> list[str]:
         """Fetch the document data from Adobe Express API and extract text models."""
-        headers = {
-            "Authorization": f"Bearer {token}",
-        }
+        headers = {}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
         api_url = ADOBE_DOC_URL_TEMPLATE.format(urn=urn)
         try:
-            response = requests.get(api_url, headers=headers, timeout=REQUEST_TIMEOUT)
-            if response.status_code == 401:  # Unauthorized, try without auth
-                logging.info("Token auth failed, trying without authentication...")
-                response = requests.get(api_url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            data = response.json()
-            doc_model = json.loads(data.get("docModel"))
+            try:
+                data = _get_json(api_url, headers)
+            except requests.HTTPError as e:
+                # Unauthorized with token, try once without
+                if not token or e.response is None or e.response.status_code != 401:
+                    raise
+                logger.info("Token auth failed, trying without authentication...")
+                data = _get_json(api_url)
+            doc_model = json_loads(data.get("docModel"))
             return self.extract_text_models(doc_model)
         except requests.RequestException as e:
-            logging.error(f"Failed to fetch document from {api_url}: {e}")
+            logger.error(f"Failed to fetch document from {api_url}: {e}")
             raise
 
-    async def _afetch_document(self, urn: str, token: str) -> list[str]:
+    async def _afetch_document(
+        self, urn: str, token: str, session: aiohttp.ClientSession
+    ) -> list[str]:
         """Asynchronously fetch the document data from Adobe Express API and extract text models."""
+        with _DOCUMENT_LOCK:
+            texts = _DOCUMENT_CACHE.get((urn, token))
+        if texts is not None:
+            return texts
         headers = {}
         if token:
             headers["Authorization"] = f"Bearer {token}"
         api_url = ADOBE_DOC_URL_TEMPLATE.format(urn=urn)
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
-        ) as session:
+        try:
             try:
-                async with session.get(api_url, headers=headers) as response:
-                    if (
-                        response.status == 401 and token
-                    ):  # Unauthorized with token, try without
-                        logging.info(
-                            "Token auth failed, trying without authentication..."
-                        )
-                        async with session.get(api_url) as response:
-                            response.raise_for_status()
-                            data = await response.json()
-                    else:
-                        response.raise_for_status()
-                        data = await response.json()
-                        doc_model = json.loads(data.get("docModel"))
-                    return self.extract_text_models(doc_model)
-            except aiohttp.ClientError as e:
-                logging.error(
-                    f"Failed to fetch document asynchronously from {api_url}: {e}"
-                )
-                raise
+                data = await _aget_json(session, api_url, headers)
+            except aiohttp.ClientResponseError as e:
+                # Unauthorized with token, try once without
+                if not token or e.status != 401:
+                    raise
+                logger.info("Token auth failed, trying without authentication...")
+                data = await _aget_json(session, api_url)
+            doc_model = json_loads(data.get("docModel"))
+            texts = self.extract_text_models(doc_model)
+        except aiohttp.ClientError as e:
+            logger.error(
+                f"Failed to fetch document asynchronously from {api_url}: {e}"
+            )
+            raise
+        with _DOCUMENT_LOCK:
+            _DOCUMENT_CACHE[(urn, token)] = texts
+        return texts
 
+    @cached(_TOKEN_CACHE, key=lambda self: CLIENT_ID, lock=_TOKEN_LOCK)
     def _get_oauth_token(self) -> str:
         """Obtain an OAuth access token for Adobe Express API authentication."""
         payload = {
@@ -121,7 +176,7 @@ class AdobeExpressLoader(BaseLoader):
             "origin": "https://new.express.adobe.com",
         }
         try:
-            response = requests.post(
+            response = SESSION.post(
                 ADOBE_TOKEN_URL, headers=headers, data=payload, timeout=REQUEST_TIMEOUT
             )
 
@@ -129,11 +184,15 @@ class AdobeExpressLoader(BaseLoader):
             token_data = response.json()
             return token_data["access_token"]
         except requests.RequestException as e:
-            logging.error(f"Failed to obtain OAuth token: {e}")
+            logger.error(f"Failed to obtain OAuth token: {e}")
             raise
 
-    async def _aget_oauth_token(self) -> str:
+    async def _aget_oauth_token(self, session: aiohttp.ClientSession) -> str:
         """Asynchronously obtain an OAuth access token for Adobe Express API authentication."""
+        with _TOKEN_LOCK:
+            token = _TOKEN_CACHE.get(CLIENT_ID)
+        if token is not None:
+            return token
         payload = {
             "guest_allowed": "true",
             "client_id": CLIENT_ID,
@@ -144,28 +203,28 @@ class AdobeExpressLoader(BaseLoader):
             "referer": "https://new.express.adobe.com/",
             "origin": "https://new.express.adobe.com",
         }
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
-        ) as session:
-            try:
-                async with session.post(
-                    ADOBE_TOKEN_URL, headers=headers, data=payload
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                    return data["access_token"]
-            except aiohttp.ClientError as e:
-                logging.error(f"Failed to obtain OAuth token asynchronously: {e}")
-                raise
+        try:
+            async with session.post(
+                ADOBE_TOKEN_URL, headers=headers, data=payload
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
+                token = data["access_token"]
+        except aiohttp.ClientError as e:
+            logger.error(f"Failed to obtain OAuth token asynchronously: {e}")
+            raise
+        with _TOKEN_LOCK:
+            _TOKEN_CACHE[CLIENT_ID] = token
+        return token
 
     def load(self) -> list[Document]:
         """Load the document from the Adobe Express URL."""
-        urn = self._extract_urn()
+        urn = self.urn
         try:
             token = self._get_oauth_token()
             texts = self._fetch_document(urn, token)
         except Exception as e:
-            logging.warning(f"OAuth failed ({e}), trying without authentication...")
+            logger.warning(f"OAuth failed ({e}), trying without authentication...")
             texts = self._fetch_document(
                 urn, ""
             )  # Empty token will trigger no-auth path
@@ -176,24 +235,28 @@ class AdobeExpressLoader(BaseLoader):
 
     def lazy_load(self) -> Iterator[Document]:
         """Lazy load documents, yielding one at a time."""
-        urn = self._extract_urn()
+        urn = self.urn
         try:
             token = self._get_oauth_token()
             texts = self._fetch_document(urn, token)
         except Exception as e:
-            logging.warning(f"OAuth failed ({e}), trying without authentication...")
+            logger.warning(f"OAuth failed ({e}), trying without authentication...")
             texts = self._fetch_document(urn, "")
         for text in texts:
             yield Document(page_content=text, metadata={"source": self.url})
 
     async def aload(self) -> AsyncIterator[Document]:
         """Asynchronously load documents, yielding one at a time."""
-        urn = self._extract_urn()
-        try:
-            token = await self._aget_oauth_token()
-            texts = await self._afetch_document(urn, token)
-        except Exception as e:
-            logging.warning(f"OAuth failed ({e}), trying without authentication...")
-            texts = await self._afetch_document(urn, "")
+        urn = self.urn
+        # aiohttp sessions belong to one event loop, so share one per call
+        async with aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        ) as session:
+            try:
+                token = await self._aget_oauth_token(session)
+                texts = await self._afetch_document(urn, token, session)
+            except Exception as e:
+                logger.warning(f"OAuth failed ({e}), trying without authentication...")
+                texts = await self._afetch_document(urn, "", session)
         for text in texts:
             yield Document(page_content=text, metadata={"source": self.url})
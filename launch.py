@@ -3,23 +3,43 @@
 Launch script for CV Enhancement Streamlit App
 """
 
+import argparse
+import hashlib
 import os
 import subprocess
 import sys
 from pathlib import Path
 
 
-def install_requirements():
-    """Install required packages."""
+def install_requirements(force=False):
+    """Install required packages, skipping pip if requirements.txt is unchanged."""
+    requirements = Path("requirements.txt")
+    # The stamp lives in the environment so a fresh venv always installs
+    stamp_file = Path(sys.prefix) / ".req_stamp"
+    digest = hashlib.sha256(requirements.read_bytes()).hexdigest()
+
+    if not force:
+        try:
+            if stamp_file.read_text().strip() == digest:
+                print("✅ Requirements already up to date")
+                return True
+        except OSError:
+            pass
+
     print("📦 Installing requirements...")
     try:
         subprocess.check_call(
-            [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"]
+            [sys.executable, "-m", "pip", "install", "-r", str(requirements)]
         )
         print("✅ Requirements installed successfully!")
     except subprocess.CalledProcessError as e:
         print(f"❌ Failed to install requirements: {e}")
         return False
+
+    try:
+        stamp_file.write_text(digest)
+    except OSError as e:
+        print(f"⚠️  Could not record requirements stamp: {e}")
     return True
 
 
@@ -57,7 +77,7 @@ def launch_app():
                 "-m",
                 "streamlit",
                 "run",
-                "streamlit_app.py",
+                "app.py",
                 "--server.port",
                 "8501",
                 "--server.address",
@@ -72,6 +92,14 @@ def launch_app():
 
 def main():
     """Main launch function."""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--force-install",
+        action="store_true",
+        help="reinstall requirements even if requirements.txt is unchanged",
+    )
+    args = parser.parse_args()
+
     print("🎯 CV Enhancement Agent Launcher")
     print("=" * 40)
 
@@ -80,7 +108,7 @@ def main():
     os.chdir(script_dir)
 
     # Install requirements
-    if not install_requirements():
+    if not install_requirements(force=args.force_install):
         return
 
     # Check environment
@@ -1,30 +1,215 @@
-import cachetools.func as cachetools
-import requests
+import asyncio
+import json
+import logging
+import multiprocessing
+import threading
+import time
+from functools import lru_cache
+from types import MappingProxyType
+from multiprocessing.context import BaseContext
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
 
 from common.settings import config
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
-@cachetools.ttl_cache(maxsize=1, ttl=600)
-def get_access_token_from_copilot() -> str:
+if TYPE_CHECKING:
+    import urllib3
+
+logger = logging.getLogger(__name__)
+
+COPILOT_TOKEN_URL = "https://api.github.com/copilot_internal/v2/token"
+# (connect, read) timeouts in seconds
+REQUEST_TIMEOUT = (3.05, 10)
+TOKEN_TTL = 600
+# Refresh this many seconds before expiry so callers never wait on GitHub
+TOKEN_REFRESH_MARGIN = 30
+
+# The configured access token is fixed for the process, so the complete
+# header set for the token request is built once
+_BASE_HEADERS = MappingProxyType(
+    {
+        "editor-version": "Neovim/0.6.1",
+        "editor-plugin-verion": "copilot.vim/1.16.0",
+        "user-agent": "GithubCopilot/1.155.0",
+    }
+)
+_TOKEN_REQUEST_HEADERS = MappingProxyType(
+    {**_BASE_HEADERS, "authorization": f"token {config.COPILOT_ACCESS_TOKEN}"}
+)
+
+
+@lru_cache(maxsize=1)
+def _get_http() -> "urllib3.PoolManager":
     """
-    Retrieves the access token for Copilot from Github API.
+    Build the connection pool for the token request on first use.
 
-    Returns:
-        str: The access token if found, otherwise an empty string.
+    urllib3 is imported here rather than at module level so importing this
+    module stays cheap until a token is actually needed. This one
+    fixed-shape GET goes straight through urllib3, and the shared pool keeps
+    the api.github.com connection warm across refreshes.
     """
-    response = requests.get(
-        "https://api.github.com/copilot_internal/v2/token",
-        headers={
-            "authorization": f"token {config.COPILOT_ACCESS_TOKEN}",
-            "editor-version": "Neovim/0.6.1",
-            "editor-plugin-verion": "copilot.vim/1.16.0",
-            "user-agent": "GithubCopilot/1.155.0",
-        },
+    import urllib3
+
+    connect_timeout, read_timeout = REQUEST_TIMEOUT
+    return urllib3.PoolManager(
+        num_pools=2,
+        maxsize=4,
+        retries=urllib3.Retry(
+            total=3,
+            backoff_factor=0.25,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+        ),
+        timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+    )
+
+
+def _fetch_copilot_token() -> str:
+    """Request a fresh Copilot token from the Github API."""
+    response = _get_http().request(
+        "GET", COPILOT_TOKEN_URL, headers=_TOKEN_REQUEST_HEADERS
     )
-    if response.status_code != 200:
+    if response.status != 200:
         raise Exception(
-            f"Failed to fetch access token: {response.status_code} - {response.text}"
+            f"Failed to fetch access token: {response.status} - "
+            f"{response.data.decode(errors='replace')}"
         )
-    payload = response.json()
+    payload = json_loads(response.data)
     token = payload.get("token", "")
     return token
+
+
+class _TokenCache:
+    """
+    Holds a token and refreshes it on a background timer shortly before expiry.
+
+    The token and its expiry share one (expires_at, token) tuple that is
+    swapped in a single assignment, so reads of a fresh token take no lock;
+    the lock only serializes refreshes.
+    If a refresh fails while a previous token is held, that token is served
+    stale for a short while instead of failing the caller.
+    The timer stops once a whole token lifetime passes without a read, so an
+    idle process doesn't keep polling GitHub; the next get() fetches again.
+    """
+
+    def __init__(self, fetch: Callable[[], str], ttl: float, margin: float):
+        self._fetch = fetch
+        self._ttl = ttl
+        self._margin = margin
+        # Expiry is on the monotonic clock so wall-clock jumps can't skew it
+        self._entry: Tuple[float, str] = (0.0, "")
+        self._last_read = 0.0
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def get(self) -> str:
+        """Return the cached token, fetching it first if it is missing or stale."""
+        now = time.monotonic()
+        self._last_read = now
+        expires_at, token = self._entry
+        if expires_at - now > self._margin:
+            return token
+        with self._lock:
+            # Another thread may have refreshed while we waited
+            expires_at, token = self._entry
+            if expires_at - time.monotonic() > self._margin:
+                return token
+            try:
+                return self._refresh()
+            except Exception as e:
+                if not token:
+                    raise
+                logger.warning(
+                    f"Copilot token refresh failed, reusing previous token: {e}"
+                )
+                # Back off before the next attempt rather than retrying on
+                # every call
+                self._entry = (time.monotonic() + 2 * self._margin, token)
+                return token
+
+    def invalidate(self) -> None:
+        """Forget the token so the next get() fetches a new one."""
+        with self._lock:
+            # A rejected token must not be served stale either
+            self._entry = (0.0, "")
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _refresh(self) -> str:
+        """Fetch a new token and schedule the next refresh; caller holds the lock."""
+        token = self._fetch()
+        self._entry = (time.monotonic() + self._ttl, token)
+
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(
+            self._ttl - self._margin, self._refresh_in_background
+        )
+        self._timer.daemon = True
+        self._timer.start()
+        return token
+
+    def _refresh_in_background(self) -> None:
+        try:
+            with self._lock:
+                self._timer = None
+                if time.monotonic() - self._last_read > self._ttl:
+                    logger.debug("Copilot token unused, stopping background refresh")
+                    return
+                self._refresh()
+        except Exception as e:
+            # The next caller retries the fetch once the token goes stale
+            logger.warning(f"Background Copilot token refresh failed: {e}")
+
+
+def process_pool_context() -> Optional[BaseContext]:
+    """
+    Start method for the app's process pools.
+
+    The app runs an event-loop thread, token refresh timers and connection
+    pools, and forking a threaded process can leave children stuck on locks
+    held at fork time. Workers are started from a forkserver where available,
+    otherwise the platform default is used.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return None
+
+
+_token_cache = _TokenCache(_fetch_copilot_token, TOKEN_TTL, TOKEN_REFRESH_MARGIN)
+
+
+def get_access_token_from_copilot() -> str:
+    """
+    Retrieves the access token for Copilot from Github API.
+
+    The token is cached and refreshed in the background before it expires.
+
+    Returns:
+        str: The access token if found, otherwise an empty string.
+    """
+    return _token_cache.get()
+
+
+def invalidate_copilot_token() -> None:
+    """Drop the cached Copilot token, e.g. after the API rejected it."""
+    _token_cache.invalidate()
+
+
+async def aget_access_token_from_copilot() -> str:
+    """
+    Async version of get_access_token_from_copilot.
+
+    A refresh runs in a worker thread so it never blocks the event loop; the
+    token cache is shared with the sync version.
+
+    Returns:
+        str: The access token if found, otherwise an empty string.
+    """
+    return await asyncio.to_thread(get_access_token_from_copilot)
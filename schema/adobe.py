@@ -2,24 +2,24 @@ from __future__ import annotations
 
 from typing import Any, Dict
 
-from pydantic import BaseModel
+import msgspec
 
 
-class AssetURLs(BaseModel):
+# Unknown fields are ignored, so the rest of the share-page payload is skipped
+# while decoding instead of being validated and kept around
+class AssetURLs(msgspec.Struct, frozen=True):
     url: str
     download_url: str
 
 
-class File(BaseModel):
+class File(msgspec.Struct, frozen=True):
     assetURLs: AssetURLs
 
 
-class Data(BaseModel):
+class Data(msgspec.Struct, frozen=True):
     file: File
 
 
-class Acrobat(BaseModel):
+class Acrobat(msgspec.Struct, frozen=True):
     data: Data
     ui: Dict[str, Any]
-
-    model_config = {"extra": "allow"}
@@ -0,0 +1,35 @@
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from agents.cv_enhancement_agent import _add_formatted_text_to_pdf  # noqa: E402
+
+
+def _render(text: str):
+    doc = fitz.open()
+    _add_formatted_text_to_pdf(doc, text)
+    return [" ".join(page.get_text().split()) for page in doc]
+
+
+def test_block_longer_than_a_page_is_kept():
+    bullets = [
+        f"- Delivered improvement number {i} across the reporting pipeline"
+        for i in range(80)
+    ]
+    pages = _render("EXPERIENCE\n" + "\n".join(bullets))
+
+    assert len(pages) > 1
+    assert all(pages)
+    text = " ".join(pages)
+    for bullet in bullets:
+        assert bullet in text
+
+
+def test_line_longer_than_a_page_is_kept():
+    words = [f"word{i}" for i in range(2000)]
+    pages = _render(" ".join(words))
+
+    assert len(pages) > 1
+    text = " ".join(pages)
+    for word in words:
+        assert f" {word} " in f" {text} "